@@ -0,0 +1,71 @@
+import time
+from collections import OrderedDict
+
+import pygame
+
+TEXT_CACHE_SIZE = 128  # Rendered text surfaces kept in the LRU cache
+
+
+class Assets:
+    # Lazily initialised pygame subsystems, cached fonts and an LRU cache of
+    # rendered text surfaces. Only the subsystems that are actually used get
+    # started (pygame.init() would also bring up audio, joysticks, etc.), and
+    # the time spent in each is recorded for the startup report.
+
+    def __init__(self, text_cache_size=TEXT_CACHE_SIZE):
+        self.text_cache_size = text_cache_size
+        self.fonts = {}
+        self.texts = OrderedDict()
+        self.init_times = {}  # Subsystem -> seconds spent initialising it
+        self.text_hits = 0
+        self.text_misses = 0
+        self.text_render_time = 0.0
+
+    def ensure(self, name, module):
+        # Initialise a pygame subsystem module (display, font, ...) on first use
+        if not module.get_init():
+            start = time.perf_counter()
+            module.init()
+            self.init_times[name] = time.perf_counter() - start
+
+    def init_display(self):
+        self.ensure("display", pygame.display)
+
+    def font(self, size, name=None):
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            self.ensure("font", pygame.font)
+            start = time.perf_counter()
+            font = self.fonts[key] = pygame.font.Font(name, size)
+            self.init_times[f"font {name or 'default'} {size}"] = time.perf_counter() - start
+        return font
+
+    def text(self, text, size, color, background=None, font_name=None):
+        # Rendered text surface, reused while it stays in the LRU cache
+        key = (text, size, color, background, font_name)
+        surface = self.texts.get(key)
+        if surface is not None:
+            self.texts.move_to_end(key)
+            self.text_hits += 1
+            return surface
+
+        self.text_misses += 1
+        start = time.perf_counter()
+        surface = self.font(size, font_name).render(text, True, color, background)
+        self.text_render_time += time.perf_counter() - start
+        self.texts[key] = surface
+        if len(self.texts) > self.text_cache_size:
+            self.texts.popitem(last=False)
+        return surface
+
+    def stats(self):
+        lookups = self.text_hits + self.text_misses
+        return {
+            "init_ms": {name: seconds * 1000 for name, seconds in self.init_times.items()},
+            "text_hits": self.text_hits,
+            "text_misses": self.text_misses,
+            "text_hit_rate": self.text_hits / lookups if lookups else 0.0,
+            "text_render_ms": self.text_render_time * 1000,
+            "text_cached": len(self.texts),
+        }
@@ -0,0 +1,165 @@
+import numpy as np
+from placement import CompiledShape
+from piece_generator import CATALOG
+from core import CELL_POINTS, LINE_POINTS
+
+PIECES_PER_SET = 3
+
+# splitmix64 constants for the counter-based per-env RNG
+_GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+_UINT64_MASK = (1 << 64) - 1
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+class BatchEnv:
+    # N independent games stepped together. Each board is one packed uint64
+    # (bit row * size + col), so boards up to 8x8 are supported. Legal moves,
+    # placement and line clearing are computed for every board in one pass.
+    #
+    # An action is slot * cell_count + origin, where origin = row * size + col
+    # is the top-left cell of the piece's bounding box.
+
+    def __init__(self, num_envs, grid_size=8, seed=0, catalog=CATALOG):
+        if grid_size * grid_size > 64:
+            raise ValueError("BatchEnv packs each board into a uint64; grid_size must be <= 8")
+        self.num_envs = num_envs
+        self.grid_size = grid_size
+        self.cell_count = grid_size * grid_size
+        self.shape_names = catalog.names
+        self.num_shapes = len(self.shape_names)
+        self.used_piece = self.num_shapes  # Sentinel shape id for an already placed slot
+
+        # Alias tables for weighted dealing; the coin threshold is scaled to 32 bits
+        self.alias = np.array(catalog.sampler.alias, dtype=np.uint64)
+        self.alias_threshold = np.array(
+            [min(int(prob * (1 << 32)), 1 << 32) for prob in catalog.sampler.prob], dtype=np.uint64
+        )
+
+        # Origin masks per shape (plus an all-invalid sentinel row), indexed by origin
+        self.origin_masks = np.zeros((self.num_shapes + 1, self.cell_count), dtype=np.uint64)
+        self.origin_valid = np.zeros((self.num_shapes + 1, self.cell_count), dtype=bool)
+        self.shape_cells = np.zeros(self.num_shapes + 1, dtype=np.int64)
+        for shape_id, name in enumerate(self.shape_names):
+            compiled = CompiledShape(name, catalog.shape_dict[name], grid_size)
+            self.shape_cells[shape_id] = len(compiled.cells)
+            for (grid_x, grid_y), mask in compiled.origins.items():
+                origin = grid_y * grid_size + grid_x
+                self.origin_masks[shape_id, origin] = mask
+                self.origin_valid[shape_id, origin] = True
+
+        # Row masks followed by column masks
+        row_mask = (1 << grid_size) - 1
+        col_mask = sum(1 << (row * grid_size) for row in range(grid_size))
+        self.line_masks = np.array(
+            [row_mask << (row * grid_size) for row in range(grid_size)]
+            + [col_mask << col for col in range(grid_size)],
+            dtype=np.uint64,
+        )
+
+        self.seed = seed
+        self.reset()
+
+    def reset(self, env_mask=None):
+        # Reset every env, or only those selected by a boolean mask
+        if env_mask is None:
+            env_mask = np.ones(self.num_envs, dtype=bool)
+            self.occupancy = np.zeros(self.num_envs, dtype=np.uint64)
+            self.pieces = np.zeros((self.num_envs, PIECES_PER_SET), dtype=np.int64)
+            self.score = np.zeros(self.num_envs, dtype=np.int64)
+            self.moves = np.zeros(self.num_envs, dtype=np.int64)
+            self.lines_cleared = np.zeros(self.num_envs, dtype=np.int64)
+            self.done = np.zeros(self.num_envs, dtype=bool)
+            # Each env gets its own RNG stream derived from (seed, env index)
+            self.rng_state = self._mix(
+                np.arange(self.num_envs, dtype=np.uint64)
+                + np.uint64((self.seed * _GOLDEN_GAMMA) & _UINT64_MASK)
+            )
+        self.occupancy[env_mask] = 0
+        self.score[env_mask] = 0
+        self.moves[env_mask] = 0
+        self.lines_cleared[env_mask] = 0
+        self._deal(env_mask)
+        self.legal = self.legal_moves()
+        self.done[env_mask] = ~self.legal[env_mask].any(axis=1)
+        return self.occupancy
+
+    @staticmethod
+    def _mix(z):
+        z = (z ^ (z >> np.uint64(30))) * _MIX_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_2
+        return z ^ (z >> np.uint64(31))
+
+    def _next_random(self, env_mask, count):
+        # splitmix64: advance each selected env's counter and return (n, count) uint64s
+        state = self.rng_state[env_mask]
+        steps = np.arange(1, count + 1, dtype=np.uint64) * np.uint64(_GOLDEN_GAMMA)
+        draws = self._mix(state[:, None] + steps)
+        self.rng_state[env_mask] = state + np.uint64((count * _GOLDEN_GAMMA) & _UINT64_MASK)
+        return draws
+
+    def _deal(self, env_mask):
+        draws = self._next_random(env_mask, PIECES_PER_SET)
+        # Alias method: multiply-shift maps the high 32 bits uniformly onto a
+        # column in [0, num_shapes), the low 32 bits pick it or its alias
+        columns = ((draws >> np.uint64(32)) * np.uint64(self.num_shapes)) >> np.uint64(32)
+        coins = draws & np.uint64(0xFFFFFFFF)
+        self.pieces[env_mask] = np.where(coins < self.alias_threshold[columns], columns, self.alias[columns])
+
+    def legal_moves(self):
+        # (N, 3 * cell_count) bool mask of legal actions for every env
+        masks = self.origin_masks[self.pieces]  # (N, 3, cells)
+        legal = self.origin_valid[self.pieces] & ((masks & self.occupancy[:, None, None]) == 0)
+        return legal.reshape(self.num_envs, -1)
+
+    def step(self, actions):
+        # Apply one action per env; envs that are already done ignore theirs.
+        # Returns (lines cleared, score, done) arrays.
+        actions = np.asarray(actions, dtype=np.int64)
+        active = ~self.done
+        env_ids = np.nonzero(active)[0]
+        slots, origins = np.divmod(actions[env_ids], self.cell_count)
+        if (slots < 0).any() or (slots >= PIECES_PER_SET).any():
+            raise ValueError("Action slot out of range")
+        shape_ids = self.pieces[env_ids, slots]
+        masks = self.origin_masks[shape_ids, origins]
+        valid = self.origin_valid[shape_ids, origins] & ((masks & self.occupancy[env_ids]) == 0)
+        if not valid.all():
+            raise ValueError(f"Illegal action for envs {env_ids[~valid].tolist()}")
+
+        occupancy = self.occupancy[env_ids] | masks
+
+        # Line clearing: find every full row/column, then OR-reduce their masks
+        full = (occupancy[:, None] & self.line_masks) == self.line_masks
+        cleared = np.bitwise_or.reduce(np.where(full, self.line_masks, np.uint64(0)), axis=1)
+        occupancy &= ~cleared
+        self.occupancy[env_ids] = occupancy
+
+        lines = np.zeros(self.num_envs, dtype=np.int64)
+        lines[env_ids] = full.sum(axis=1)
+        self.lines_cleared += lines
+        self.score[env_ids] += self.shape_cells[shape_ids] * CELL_POINTS + lines[env_ids] * LINE_POINTS
+        self.moves[env_ids] += 1
+
+        # Mark the slot used and deal a new set where all three are placed
+        self.pieces[env_ids, slots] = self.used_piece
+        exhausted = np.zeros(self.num_envs, dtype=bool)
+        exhausted[env_ids] = (self.pieces[env_ids] == self.used_piece).all(axis=1)
+        if exhausted.any():
+            self._deal(exhausted)
+
+        # Legal moves for the new state are kept for policies and the next check
+        self.legal = self.legal_moves()
+        self.done |= ~self.legal.any(axis=1)
+        return lines, self.score, self.done
+
+    def sample_legal_actions(self, rng):
+        # Pick a uniformly random legal action per env (0 for finished envs)
+        noise = rng.random(self.legal.shape, dtype=np.float32)
+        noise[~self.legal] = -1.0
+        return noise.argmax(axis=1)
+
+    def boards(self):
+        # Unpack the bitboards into an (N, size, size) bool array
+        bits = (self.occupancy[:, None] >> np.arange(self.cell_count, dtype=np.uint64)) & np.uint64(1)
+        return bits.astype(bool).reshape(self.num_envs, self.grid_size, self.grid_size)
@@ -0,0 +1,342 @@
+# benchmark.py
+#
+# Microbenchmarks for the game's hot paths on fixed fixtures (empty, half-full
+# and near-death boards, every catalog shape). Rendering runs on SDL's dummy
+# video driver, so no display is needed. Results can be saved as a JSON
+# baseline and later runs compared against it; any case slower than the
+# baseline by more than the threshold makes the run exit with status 1.
+#
+#   python src/benchmark.py --save baseline.json
+#   python src/benchmark.py --baseline baseline.json --threshold 0.2
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from core import Piece
+from game import Game
+from object import BlockObject, render_3d_block, spawn_random_block
+from piece_generator import CATALOG
+from shapes import NEON_COLORS
+
+FIXTURES = ("empty", "half_full", "near_death")
+DEFAULT_THRESHOLD = 0.25  # Allowed slowdown against the baseline (0.25 = 25%)
+DEFAULT_REPEATS = 5  # Timed runs per case; the median is reported
+TARGET_SECONDS = 0.05  # Approximate length of one timed run
+
+
+def fixture_board(name, size):
+    # Deterministic (mask, colour) list for a named fixture; none has a full line
+    cells = []
+    if name == "half_full":
+        rng = random.Random(1)
+        cells = [index for index in range(size * size) if rng.random() < 0.5]
+        # Open one cell in every line that came out full
+        filled = set(cells)
+        for row in range(size):
+            if all(row * size + col in filled for col in range(size)):
+                filled.discard(row * size + rng.randrange(size))
+        for col in range(size):
+            if all(row * size + col in filled for row in range(size)):
+                filled.discard(rng.randrange(size) * size + col)
+        cells = sorted(filled)
+    elif name == "near_death":
+        # Isolated single holes, at least one in every row and column, so only
+        # the 1x1 block still fits
+        cells = [
+            row * size + col for row in range(size) for col in range(size) if (row + 2 * col) % 5
+        ]
+
+    masks = [0] * len(NEON_COLORS)
+    for i, index in enumerate(cells):
+        masks[i % len(NEON_COLORS)] |= 1 << index
+    return [(mask, color) for mask, color in zip(masks, NEON_COLORS) if mask]
+
+
+def load_board(game, fixture):
+    board = game.board
+    board.reset()
+    for mask, color in fixture:
+        board.place(mask, color)
+
+
+def make_block(info, size):
+    block = BlockObject(0, 0, NEON_COLORS[0], size, info.shape, info.name)
+    block.slot = 0
+    return block
+
+
+def legal_placements(game, fixture):
+    # (shape info, col, row) for every catalog shape and origin that fits the fixture
+    load_board(game, fixture)
+    occupancy = game.board.occupancy
+    return [
+        (info, col, row)
+        for info in CATALOG.shapes
+        for col, row in game.placement_index.compiled(info.name).legal_origins(occupancy)
+    ]
+
+
+# Each case builder returns (setup, op, ops_per_call). setup(i) prepares the
+# state for call i outside the timed region and returns op's argument; a case
+# without setup is timed as a whole batch.
+
+def case_can_place_block(game, fixture):
+    load_board(game, fixture)
+    size = game.grid_size
+    calls = [
+        (make_block(info, game.cell_size), grid_x, grid_y)
+        for info in CATALOG.shapes
+        for grid_y in range(size)
+        for grid_x in range(size)
+    ]
+    can_place_block = game.can_place_block
+
+    def op(_):
+        for block, grid_x, grid_y in calls:
+            can_place_block(block, grid_x, grid_y)
+
+    return None, op, len(calls)
+
+
+def case_snap_to_grid(game, fixture):
+    placements = legal_placements(game, fixture)
+    rng = random.Random(2)
+    core = game.core
+
+    def setup(i):
+        info, col, row = placements[rng.randrange(len(placements))]
+        load_board(game, fixture)
+        # Keep the other two slots filled so no new set is dealt
+        core.pieces = [Piece(info.name, info.shape, NEON_COLORS[i % len(NEON_COLORS)])] + [
+            Piece(CATALOG.shapes[0].name, CATALOG.shapes[0].shape, NEON_COLORS[0]) for _ in range(2)
+        ]
+        core.done = False
+        block = make_block(info, game.cell_size)
+        block.x = game.grid_x + col * game.cell_size
+        block.y = game.grid_y + row * game.cell_size
+        return block
+
+    return setup, game.snap_to_grid, 1
+
+
+def case_check_game_over(game, fixture):
+    core = game.core
+    # The three largest pieces: the slowest case for the "any move left" scan
+    largest = sorted(CATALOG.shapes, key=lambda info: -len(info.cells))[:3]
+    pieces = [Piece(info.name, info.shape, NEON_COLORS[0]) for info in largest]
+
+    def setup(_):
+        load_board(game, fixture)
+        core.pieces = list(pieces)
+        game.placement_index.cached_occupancy = None  # Measure the uncached scan
+        game.game_over = False
+
+    def op(_):
+        # The core recomputes done after every placement; Game reads it
+        core.done = not core.has_legal_move()
+        game.check_game_over()
+
+    return setup, op, 1
+
+
+def case_check_and_clear(game, fixture):
+    size = game.grid_size
+    board = game.board
+
+    def setup(i):
+        # Complete one row and one column, as if a piece had just filled them
+        line = i % size
+        load_board(game, fixture)
+        board.place((board.row_masks[line] | board.col_masks[line]) & ~board.occupancy, NEON_COLORS[0])
+        return line
+
+    def op(line):
+        game.clear_line.check_and_clear((line,), (line,))
+
+    return setup, op, 1
+
+
+def case_draw_grid_full(game, fixture):
+    layer = game.grid_layer
+
+    def setup(_):
+        load_board(game, fixture)
+        layer.drawn[:] = b"\xff" * len(layer.drawn)  # Every cell differs from the layer
+
+    return setup, lambda _: game.draw_grid(), 1
+
+
+def case_draw_grid_one_cell(game, fixture):
+    board = game.board
+
+    def setup(i):
+        load_board(game, fixture)
+        game.draw_grid()
+        # Toggle one cell, as a single placement or clear would
+        index = i % board.cell_count
+        if (board.occupancy >> index) & 1:
+            board.clear(1 << index)
+        else:
+            board.place(1 << index, NEON_COLORS[i % len(NEON_COLORS)])
+
+    return setup, lambda _: game.draw_grid(), 1
+
+
+def case_spawn_random_block(game):
+    rng = random.Random(3)
+    calls = 1000
+
+    def op(_):
+        for _ in range(calls):
+            spawn_random_block(0, 0, rng=rng)
+
+    return None, op, calls
+
+
+def case_render_3d_block(game, size):
+    surface = pygame.Surface((size * 4, size * 4))
+    rects = [pygame.Rect(col * size, row * size, size, size) for row in range(4) for col in range(4)]
+
+    def op(_):
+        for i, rect in enumerate(rects):
+            render_3d_block(surface, rect, NEON_COLORS[i % len(NEON_COLORS)])
+
+    return None, op, len(rects)
+
+
+def build_cases(game):
+    cases = {}
+    fixtures = {name: fixture_board(name, game.grid_size) for name in FIXTURES}
+    for name, fixture in fixtures.items():
+        cases[f"can_place_block/{name}"] = lambda f=fixture: case_can_place_block(game, f)
+        cases[f"snap_to_grid/{name}"] = lambda f=fixture: case_snap_to_grid(game, f)
+        cases[f"check_game_over/{name}"] = lambda f=fixture: case_check_game_over(game, f)
+        cases[f"check_and_clear/{name}"] = lambda f=fixture: case_check_and_clear(game, f)
+        cases[f"draw_grid_full/{name}"] = lambda f=fixture: case_draw_grid_full(game, f)
+        cases[f"draw_grid_one_cell/{name}"] = lambda f=fixture: case_draw_grid_one_cell(game, f)
+    cases["spawn_random_block"] = lambda: case_spawn_random_block(game)
+    cases["render_3d_block/50px"] = lambda: case_render_3d_block(game, 50)
+    cases["render_3d_block/25px"] = lambda: case_render_3d_block(game, 25)
+    return cases
+
+
+def time_run(setup, op, calls):
+    # Seconds spent in op over `calls` calls, excluding setup
+    perf_counter = time.perf_counter
+    if setup is None:
+        start = perf_counter()
+        for _ in range(calls):
+            op(None)
+        return perf_counter() - start
+    total = 0.0
+    for i in range(calls):
+        arg = setup(i)
+        start = perf_counter()
+        op(arg)
+        total += perf_counter() - start
+    return total
+
+
+def measure(setup, op, ops_per_call, repeats):
+    # Calibrate the call count to roughly TARGET_SECONDS per run, then report
+    # the median time per operation in microseconds
+    time_run(setup, op, 1)  # Warm up caches before calibrating
+    calls = 1
+    while True:
+        elapsed = time_run(setup, op, calls)
+        if elapsed >= TARGET_SECONDS / 10 or calls >= 1 << 20:
+            break
+        calls *= 2
+    calls = max(1, int(calls * TARGET_SECONDS / max(elapsed, 1e-9)))
+    runs = [time_run(setup, op, calls) / (calls * ops_per_call) for _ in range(repeats)]
+    return {"us_per_op": statistics.median(runs) * 1e6, "ops": calls * ops_per_call * repeats}
+
+
+def run_benchmarks(grid_size=8, repeats=DEFAULT_REPEATS, name_filter=None):
+    game = Game(grid_size=grid_size, seed=0)
+    results = {}
+    # check_game_over reports the game over on stdout
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, build in build_cases(game).items():
+            if name_filter and name_filter not in name:
+                continue
+            results[name] = measure(*build(), repeats)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+            "grid_size": grid_size,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, threshold):
+    # Rows of (name, baseline us, current us, ratio, regressed) for shared cases
+    rows = []
+    for name, result in report["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            rows.append((name, None, result["us_per_op"], None, False))
+            continue
+        ratio = result["us_per_op"] / previous["us_per_op"]
+        rows.append((name, previous["us_per_op"], result["us_per_op"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def format_table(rows):
+    lines = [f"{'case':34} {'baseline us':>12} {'current us':>12} {'ratio':>7}"]
+    for name, previous, current, ratio, regressed in rows:
+        previous = f"{previous:12.3f}" if previous is not None else f"{'-':>12}"
+        ratio = f"{ratio:7.2f}" if ratio is not None else f"{'-':>7}"
+        lines.append(f"{name:34} {previous} {current:12.3f} {ratio}{'  REGRESSION' if regressed else ''}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Block Blast hot-path microbenchmarks")
+    parser.add_argument("--grid-size", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="timed runs per case")
+    parser.add_argument("--filter", help="only run cases whose name contains this text")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown before a case counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.grid_size, args.repeats, args.filter)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    baseline = {"results": {}}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    rows = compare(report, baseline, args.threshold)
+    print(format_table(rows))
+
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+class Board:
+    # Occupancy is stored as a single integer bitboard: bit (row * size + col)
+    # is set when that cell is filled. Colours live in a separate compact array
+    # of palette indices (0 means empty). Per-row and per-column fill counters
+    # are kept in step with every place/clear so full lines are found without
+    # touching the bitboard.
+
+    def __init__(self, size=8):
+        self.size = size
+        self.cell_count = size * size
+        self.full_mask = (1 << self.cell_count) - 1
+
+        # Precomputed masks for full-line detection
+        row_mask = (1 << size) - 1
+        col_mask = sum(1 << (row * size) for row in range(size))
+        self.row_masks = [row_mask << (row * size) for row in range(size)]
+        self.col_masks = [col_mask << col for col in range(size)]
+
+        # Palette of colours seen so far; index 0 is reserved for empty cells
+        self.palette = [0]
+        self.palette_index = {}
+
+        self.reset()
+
+    def reset(self):
+        self.occupancy = 0
+        self.colors = bytearray(self.cell_count)
+        self.row_counts = [0] * self.size
+        self.col_counts = [0] * self.size
+
+    def color_id(self, color):
+        # Map a colour tuple to its compact palette index
+        index = self.palette_index.get(color)
+        if index is None:
+            index = len(self.palette)
+            self.palette.append(color)
+            self.palette_index[color] = index
+        return index
+
+    def can_place_mask(self, mask):
+        return not self.occupancy & mask
+
+    def place(self, mask, color):
+        # Commit a (pre-validated) mask to the board with the given colour
+        self.occupancy |= mask
+        color_id = self.color_id(color)
+        colors = self.colors
+        row_counts = self.row_counts
+        col_counts = self.col_counts
+        size = self.size
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            colors[index] = color_id
+            row, col = divmod(index, size)
+            row_counts[row] += 1
+            col_counts[col] += 1
+            mask ^= low
+
+    def full_rows_cols(self, rows=None, cols=None):
+        # Full rows and columns of the current board from the fill counters;
+        # only the given rows/cols are examined when passed
+        size = self.size
+        rows = range(size) if rows is None else rows
+        cols = range(size) if cols is None else cols
+        return (
+            [row for row in rows if self.row_counts[row] == size],
+            [col for col in cols if self.col_counts[col] == size],
+        )
+
+    def full_lines(self, occupancy=None, rows=None, cols=None):
+        # Return the combined mask of every full row and column, and how many
+        # lines that is. Pass an occupancy to evaluate a hypothetical board, and
+        # rows/cols to only examine those lines (e.g. the ones a piece touched).
+        if occupancy is None:
+            occupancy = self.occupancy
+        row_masks = self.row_masks if rows is None else [self.row_masks[row] for row in rows]
+        col_masks = self.col_masks if cols is None else [self.col_masks[col] for col in cols]
+        cleared = 0
+        lines = 0
+        for line_mask in row_masks:
+            if occupancy & line_mask == line_mask:
+                cleared |= line_mask
+                lines += 1
+        for line_mask in col_masks:
+            if occupancy & line_mask == line_mask:
+                cleared |= line_mask
+                lines += 1
+        return cleared, lines
+
+    def clear(self, mask):
+        # Remove every cell in the mask from the board
+        mask &= self.occupancy
+        self.occupancy &= ~mask
+        colors = self.colors
+        row_counts = self.row_counts
+        col_counts = self.col_counts
+        size = self.size
+        while mask:
+            low = mask & -mask
+            index = low.bit_length() - 1
+            colors[index] = 0
+            row, col = divmod(index, size)
+            row_counts[row] -= 1
+            col_counts[col] -= 1
+            mask ^= low
@@ -1,33 +1,63 @@
-import pygame
+class ClearEvent:
+    # One placement's worth of line clearing. combo counts consecutive
+    # placements that cleared at least one line (0 when nothing cleared).
+    __slots__ = ("rows", "cols", "mask", "cells", "combo")
+
+    def __init__(self, rows, cols, mask, cells, combo):
+        self.rows = rows
+        self.cols = cols
+        self.mask = mask  # Bitboard of the removed cells
+        self.cells = cells  # Number of cells removed (shared cells count once)
+        self.combo = combo
+
+    @property
+    def lines(self):
+        return len(self.rows) + len(self.cols)
+
+    def __bool__(self):
+        return bool(self.rows or self.cols)
+
+    def __repr__(self):
+        return f"ClearEvent(rows={self.rows}, cols={self.cols}, cells={self.cells}, combo={self.combo})"
 
 
 class ClearLine:
-    def __init__(self, grid):
-        self.grid = grid
-
-    def check_and_clear(self):
-        # Check and clear full rows
-        for row in range(len(self.grid)):
-            if all(self.grid[row]):  # If all cells in the row are filled
-                # print(f"Clearing row {row}")
-                self.clear_row(row)
-
-        # Check and clear full columns
-        for col in range(len(self.grid[0])):
-            if all(self.grid[row][col] for row in range(len(self.grid))):  # If all cells in the column are filled
-                # print(f"Clearing column {col}")
-                self.clear_column(col)
-
-        # Debugging: Print the grid state after clearing
-        # print("Grid state after clearing:")
-        # for row in self.grid:
-        #     print(row)
+    def __init__(self, board):
+        self.board = board
+        self.combo = 0
+        self.listeners = []  # Callbacks run as callback(event) for every clear
+
+    def reset(self):
+        self.combo = 0
+
+    def check_and_clear(self, rows=None, cols=None):
+        # Full rows and columns are found together from the board's fill
+        # counters, so a row and a column sharing a cell both clear. Only the
+        # given rows/cols (the ones a piece touched) are examined when passed.
+        # Returns a ClearEvent, which is falsy when nothing was cleared.
+        board = self.board
+        full_rows, full_cols = board.full_rows_cols(rows, cols)
+        if not (full_rows or full_cols):
+            self.combo = 0
+            return ClearEvent((), (), 0, 0, 0)
+
+        cleared = 0
+        for row in full_rows:
+            cleared |= board.row_masks[row]
+        for col in full_cols:
+            cleared |= board.col_masks[col]
+        board.clear(cleared)
+        self.combo += 1
+
+        event = ClearEvent(tuple(full_rows), tuple(full_cols), cleared, bin(cleared).count("1"), self.combo)
+        for callback in self.listeners:
+            callback(event)
+        return event
 
     def clear_row(self, row):
-        # Clear the row by setting all cells to 0
-        self.grid[row] = [0] * len(self.grid[row])
+        # Clear the row by removing all of its cells
+        self.board.clear(self.board.row_masks[row])
 
     def clear_column(self, col):
-        # Clear the column by setting all cells to 0
-        for row in range(len(self.grid)):
-            self.grid[row][col] = 0
+        # Clear the column by removing all of its cells
+        self.board.clear(self.board.col_masks[col])
@@ -0,0 +1,141 @@
+import random
+from board import Board
+from clear_line import ClearLine
+from placement import PlacementIndex
+from shapes import NEON_COLORS
+from piece_generator import CATALOG, make_generator
+from replay import Replay
+
+# Points per cell placed and per line cleared
+CELL_POINTS = 1
+LINE_POINTS = 10
+
+
+class Piece:
+    __slots__ = ("name", "shape", "color")
+
+    def __init__(self, name, shape, color):
+        self.name = name
+        self.shape = shape
+        self.color = color
+
+
+class GameCore:
+    # Pure game logic with no pygame dependency and no frame pacing.
+    # The three current pieces live in fixed slots; a slot becomes None once its
+    # piece is placed, and a new set is dealt when all three are used.
+    #
+    # Every game is seeded (a fresh random seed is drawn when none is given), so
+    # a game is fully described by its seed, the generator strategy and the
+    # placements made.
+
+    def __init__(self, grid_size=8, seed=None, catalog=CATALOG, colors=NEON_COLORS, record=False,
+                 generator="weighted"):
+        self.grid_size = grid_size
+        self.catalog = catalog
+        self.shape_names = catalog.names
+        self.shape_ids = {info.name: info.id for info in catalog.shapes}
+        self.colors = tuple(colors)
+        self.rng = random.Random()
+        if record and not isinstance(generator, str):
+            raise ValueError("Recording needs a named generator so the replay can rebuild it")
+        self.record = record  # Keep a Replay of each game in self.replay
+        self.generator_name = generator if isinstance(generator, str) else None
+        self.on_step = []  # Callbacks run as callback(core) after every placement
+
+        self.board = Board(grid_size)
+        self.clear_line = ClearLine(self.board)
+        self.placement_index = PlacementIndex(catalog.shape_dict, grid_size)
+        # Strategy name from piece_generator.GENERATORS, or a generator object
+        self.generator = make_generator(generator, catalog, self.rng, self.placement_index)
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seed = random.randrange(1 << 63)
+        self.seed = seed
+        self.rng.seed(seed)
+        self.generator.reset()
+        self.replay = Replay(seed, self.grid_size, generator=self.generator_name) if self.record else None
+        self.board.reset()
+        self.clear_line.reset()
+        self.last_clear = None  # ClearEvent from the most recent placement
+        self.score = 0
+        self.moves = 0
+        self.lines_cleared = 0
+        self.pieces = self.deal()
+        self.done = not self.has_legal_move()
+        return self
+
+    def make_piece(self, shape_id):
+        info = self.catalog.shapes[shape_id]
+        return Piece(info.name, info.shape, self.rng.choice(self.colors))
+
+    def deal(self):
+        # The generator sees the board so strategies can react to it
+        return [self.make_piece(shape_id) for shape_id in self.generator.next_set(self.board.occupancy)]
+
+    def has_legal_move(self):
+        occupancy = self.board.occupancy
+        for piece in self.pieces:
+            if piece and self.placement_index.can_place_anywhere(piece.name, occupancy):
+                return True
+        return False
+
+    def can_place(self, piece_index, row, col):
+        piece = self.pieces[piece_index]
+        if piece is None:
+            return False
+        mask = self.placement_index.mask_at(piece.name, col, row)
+        return mask is not None and self.board.can_place_mask(mask)
+
+    def legal_moves(self):
+        # All (piece_index, row, col) placements available right now
+        occupancy = self.board.occupancy
+        moves = []
+        for piece_index, piece in enumerate(self.pieces):
+            if piece is None:
+                continue
+            for col, row in self.placement_index.compiled(piece.name).legal_origins(occupancy):
+                moves.append((piece_index, row, col))
+        return moves
+
+    def placement_points(self, cells, event):
+        # Points for placing a piece of `cells` cells that produced `event`
+        # (a ClearEvent carrying the rows, columns and combo count)
+        return cells * CELL_POINTS + event.lines * LINE_POINTS
+
+    def step(self, piece_index, row, col):
+        # Place a piece and return (cleared lines, score, done)
+        if self.done:
+            raise ValueError("Game is over")
+        piece = self.pieces[piece_index]
+        if piece is None:
+            raise ValueError(f"Piece {piece_index} has already been placed")
+        compiled = self.placement_index.compiled(piece.name)
+        mask = compiled.mask_at(col, row)
+        if mask is None or not self.board.can_place_mask(mask):
+            raise ValueError(f"Cannot place {piece.name} at row {row}, col {col}")
+
+        self.board.place(mask, piece.color)
+        # Only lines the piece touched can have become full
+        event = self.clear_line.check_and_clear(
+            range(row, row + compiled.height), range(col, col + compiled.width)
+        )
+        self.last_clear = event
+        lines = event.lines
+        if self.replay:
+            self.replay.record(piece_index, self.shape_ids[piece.name], row, col)
+        self.pieces[piece_index] = None
+        self.moves += 1
+        self.lines_cleared += lines
+        self.score += self.placement_points(len(compiled.cells), event)
+
+        # Deal a new set once all three pieces have been placed
+        if not any(self.pieces):
+            self.pieces = self.deal()
+
+        self.done = not self.has_legal_move()
+        for callback in self.on_step:
+            callback(self)
+        return lines, self.score, self.done
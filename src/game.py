@@ -1,10 +1,35 @@
+import time
 import pygame
-from object import BlockObject, spawn_random_block, render_3d_block
-from clear_line import ClearLine
+from assets import Assets
+from object import BlockObject
+from input_handler import InputHandler
+from core import GameCore
+from render_cache import TileCache, GridLayer, GhostRenderer
+from solver import MAX_HINT_GRID_SIZE, HintWorker
+
+HINT_COLOR = (255, 215, 0)  # Outline colour for the suggested placement
+GRID_AREA = 400  # Pixels available for the grid; cells shrink to fit larger boards
+MAX_CELL_SIZE = 50
+MAX_GRID_SIZE = GRID_AREA  # Cells never shrink below one pixel
+PREVIEW_CELL_SIZE = 25
+PREVIEW_SPACING = 100  # Horizontal distance between preview blocks
+
+# Main loop pacing
+SIM_STEP = 1 / 60  # Fixed simulation timestep in seconds
+MAX_SIM_STEPS = 5  # Simulation steps run per loop at most, so a stall cannot snowball
+MAX_FPS = 60  # Render cap while something is moving
+HINT_POLL_MS = 50  # Wake-up interval while a hint search is running
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    # Renderer and input adapter on top of GameCore, which owns the board,
+    # the current pieces and all placement/clearing rules
+    def __init__(self, grid_size=8, seed=None, hints=False, profiler=None, record=False, telemetry=None):
+        self.init_start = time.perf_counter()
+        self.startup_time = None  # Seconds from construction to the first presented frame
+
+        # Only the display is started up front; fonts load on first use
+        self.assets = Assets()
+        self.assets.init_display()
         self.screen_width = 800
         self.screen_height = 600
         self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
@@ -12,9 +37,9 @@ class Game:
         self.running = True
         self.game_over = False  # Track if the game is over
 
-        # Grid setup (8x8)
-        self.grid_size = 8
-        self.cell_size = 50
+        # Grid setup (8x8 by default); the cell size scales down for larger boards
+        self.grid_size = grid_size
+        self.cell_size = max(1, min(MAX_CELL_SIZE, GRID_AREA // grid_size))
         self.grid_width = self.grid_size * self.cell_size
         self.grid_height = self.grid_size * self.cell_size
 
@@ -22,219 +47,368 @@ class Game:
         self.grid_x = (self.screen_width - self.grid_width) // 2
         self.grid_y = (self.screen_height - self.grid_height) // 2
 
-        # Initialize the grid
-        self.grid = [[0 for _ in range(self.grid_size)] for _ in range(self.grid_size)]
+        # Pure-logic game state (board, pieces, score) with a seedable RNG
+        self.core = GameCore(self.grid_size, seed=seed, record=record)
+        self.board = self.core.board
+        self.placement_index = self.core.placement_index
+        self.clear_line = self.core.clear_line
 
         # Define spawn positions for preview blocks
         self.block_spawn_positions = [
-            (self.grid_x + i * (self.cell_size + 50), self.grid_y + self.grid_height + 20)
+            (self.grid_x + i * PREVIEW_SPACING, self.grid_y + self.grid_height + 20)
             for i in range(3)
         ]
 
         # Create preview blocks (small icons)
-        self.preview_blocks = [self.spawn_preview_block(pos) for pos in self.block_spawn_positions]
+        self.preview_blocks = [
+            self.spawn_preview_block(pos, slot) for slot, pos in enumerate(self.block_spawn_positions)
+        ]
         self.active_block = None  # The full-size block being dragged
         self.active_block_original_position = None  # Store the original position of the active block
         self.active_block_index = None  # Track which preview block was picked up
         self.placed_blocks = 0  # Counter for placed blocks
+        self.needs_game_over_check = True  # Set whenever the grid or preview set changes
 
-        # Initialize ClearLine
-        self.clear_line = ClearLine(self.grid)
-
-    def spawn_preview_block(self, position):
+        # Rendering caches: baked block tiles and the grid drawn over a static background
+        self.tile_cache = TileCache()
+        self.grid_layer = GridLayer(
+            (self.screen_width, self.screen_height),
+            self.grid_x, self.grid_y, self.grid_size, self.cell_size, self.tile_cache,
+        )
+        self.ghost_renderer = GhostRenderer(self.board, self.grid_x, self.grid_y, self.cell_size)
+        self.sprite_rects = []  # Screen areas covered by sprites last frame
+        self.last_sprite_signature = None
+        self.full_redraw = True  # Push the whole screen on the first frame
+
+        # All pointer input goes through one handler
+        self.input = InputHandler(self, self.core.catalog)
+        self.last_drain = time.perf_counter()  # When the event queue was last emptied
+
+        # Optional best-move hints, searched in a background process
+        if hints and self.grid_size > MAX_HINT_GRID_SIZE:
+            print(f"Hints are only available up to {MAX_HINT_GRID_SIZE}x{MAX_HINT_GRID_SIZE} grids; disabled.")
+            hints = False
+        self.hint_worker = HintWorker(self.grid_size) if hints else None
+        self.hint = None  # [(slot, row, col), ...] best sequence for the current position
+
+        # Optional frame-phase profiler (see profiler.FrameProfiler)
+        self.profiler = profiler
+        if profiler:
+            profiler.instrument(self)
+
+        # Optional telemetry sink (see telemetry.TelemetrySink); records are buffered
+        # in memory and written to disk on a background thread
+        self.telemetry = telemetry
+        if telemetry:
+            telemetry.session(self.core, False)
+
+    def spawn_preview_block(self, position, slot):
+        # Create a preview block (small icon) for the core piece in this slot
         x, y = position
-        return spawn_random_block(x, y, preview=True)
+        piece = self.core.pieces[slot]
+        block = BlockObject(x, y, piece.color, PREVIEW_CELL_SIZE, piece.shape, piece.name)
+        block.slot = slot
+        return block
 
     def spawn_full_block(self, preview_block):
         # Create a full-size block based on the preview block's shape and color
-        return BlockObject(
+        block = BlockObject(
             preview_block.x,  # Start at the same position as the preview block
             preview_block.y,
             preview_block.color,  # Use the same color
-            50,  # Full-size block
+            self.cell_size,  # Full-size block
             preview_block.shape,  # Use the same shape
+            preview_block.shape_name,
         )
+        block.slot = preview_block.slot
+        return block
 
     def run(self):
+        # Event-driven loop. While nothing is moving the loop sleeps in
+        # pygame.event.wait, so an idle window costs no CPU. Simulation advances
+        # on a fixed timestep and a frame is only drawn when something changed.
+        self.set_motion_events(False)
+        accumulator = 0.0
+        previous = time.perf_counter()
         while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
+            idle = self.is_idle()
+            events = self.next_events(idle)
+            if self.profiler:
+                self.profiler.begin_frame()
+            frame_start = time.perf_counter()
+            self.pump_events(events)
+
+            now = time.perf_counter()
+            if idle:
+                # Nothing advanced while asleep; react to the wake-up immediately
+                accumulator = SIM_STEP
+            else:
+                accumulator = min(accumulator + now - previous, SIM_STEP * MAX_SIM_STEPS)
+            previous = now
+            while accumulator >= SIM_STEP:
                 if not self.game_over:
-                    self.handle_events(event)
+                    self.update()
+                accumulator -= SIM_STEP
 
-            if not self.game_over:
-                self.update()
             self.render()
-            self.clock.tick(60)
+            if self.profiler:
+                self.profiler.end_frame()
+            if self.telemetry:
+                self.telemetry.frame(time.perf_counter() - frame_start)
+            if not self.is_idle():
+                self.clock.tick(MAX_FPS)
+
+        if self.hint_worker:
+            self.hint_worker.shutdown()
+
+    def is_idle(self):
+        # True when nothing will change until the next input event, or until a
+        # running hint search finishes (next_events then wakes up to poll it)
+        if self.game_over:
+            return True
+        return not (self.active_block or self.needs_game_over_check)
+
+    def next_events(self, idle):
+        # Block until input arrives when idle (waking periodically while a hint
+        # search runs), otherwise take whatever is queued without waiting.
+        # Every event returned was queued after the previous drain or, when
+        # the loop had to wait, no earlier than the wake-up the first one caused.
+        queued_after = self.last_drain
+        if idle and not pygame.event.peek():
+            timeout = HINT_POLL_MS if self.hint_worker and self.hint_worker.searching() else 0
+            first = pygame.event.wait(timeout)
+            queued_after = time.perf_counter()
+            events = [first] + pygame.event.get()
+        else:
+            events = pygame.event.get()
+        self.last_drain = time.perf_counter()
+        self.input.events_queued_after(queued_after)
+        return coalesce_motion(events)
+
+    def set_motion_events(self, enabled):
+        # Mouse motion only matters while a block is dragged; blocking it
+        # otherwise keeps hovering over the window from waking the loop
+        if enabled:
+            pygame.event.set_allowed(pygame.MOUSEMOTION)
+        else:
+            pygame.event.set_blocked(pygame.MOUSEMOTION)
+
+    def pump_events(self, events):
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE):
+                self.full_redraw = True  # The window contents were lost
+            if not self.game_over:
+                self.handle_events(event)
 
     def handle_events(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            for i, preview_block in enumerate(self.preview_blocks):
-                if self.is_mouse_on_block(preview_block):
-                    # Spawn the full-size block and start dragging it
-                    self.active_block = self.spawn_full_block(preview_block)
-                    self.active_block.dragging = True
-                    self.active_block_original_position = (preview_block.x, preview_block.y)
-                    self.active_block_index = i  # Track which preview block was picked up
-
-                    # Calculate the offset based on the new full-sized block
-                    self.active_block.offset_x = mouse_x - self.active_block.x
-                    self.active_block.offset_y = mouse_y - self.active_block.y
-
-                    # Remove the preview block
-                    del self.preview_blocks[i]
-                    break
-
-        elif event.type == pygame.MOUSEBUTTONUP:
-            if self.active_block and self.active_block.dragging:
-                self.active_block.dragging = False
-                if self.snap_to_grid(self.active_block):
-                    self.active_block.placed = True
-                    self.placed_blocks += 1
-                    self.active_block = None  # Clear the active block
-
-                    # Check if all blocks in the current set have been placed
-                    if self.placed_blocks == 3:
-                        self.spawn_new_set_of_blocks()
-                else:
-                    # If not placed, return the block to its original position
-                    self.active_block.x, self.active_block.y = self.active_block_original_position
-                    self.active_block.size = 25  # Resize it back to preview size
-                    self.preview_blocks.insert(self.active_block_index, self.active_block)  # Restore it to the preview list
-                    self.active_block = None  # Clear the active block
+        # Pointer events are hit-tested and turned into drags by the input handler
+        self.input.handle_event(event)
+
+    def pick_up_block(self, index, pos):
+        # Replace the preview block with a full-size block dragged from pos
+        preview_block = self.preview_blocks.pop(index)
+        self.active_block = self.spawn_full_block(preview_block)
+        self.active_block.dragging = True
+        self.active_block_original_position = (preview_block.x, preview_block.y)
+        self.active_block_index = index  # Track which preview block was picked up
+
+        # Calculate the offset based on the new full-sized block
+        self.active_block.offset_x = pos[0] - self.active_block.x
+        self.active_block.offset_y = pos[1] - self.active_block.y
+        self.set_motion_events(True)
+        if self.telemetry:
+            self.telemetry.event("pickup", preview_block.slot, preview_block.shape_name)
+
+    def drop_active_block(self):
+        # Place the dragged block if it fits, otherwise return it to the previews
+        self.active_block.dragging = False
+        self.set_motion_events(False)
+        if self.snap_to_grid(self.active_block):
+            self.hint = None  # The position changed; wait for a fresh search
+            self.active_block.placed = True
+            self.placed_blocks += 1
+            self.active_block = None  # Clear the active block
+            self.needs_game_over_check = True
+
+            # Check if all blocks in the current set have been placed
+            if self.placed_blocks == 3:
+                self.spawn_new_set_of_blocks()
+        else:
+            if self.telemetry:
+                self.telemetry.event("rejected", self.active_block.slot, self.active_block.shape_name)
+            # If not placed, return the block to its original position
+            self.active_block.x, self.active_block.y = self.active_block_original_position
+            self.active_block.size = PREVIEW_CELL_SIZE  # Resize it back to preview size
+            self.preview_blocks.insert(self.active_block_index, self.active_block)  # Restore it to the preview list
+            self.active_block = None  # Clear the active block
+            self.needs_game_over_check = True
 
     def spawn_new_set_of_blocks(self):
-        # Spawn a new set of preview blocks
-        self.preview_blocks = [self.spawn_preview_block(pos) for pos in self.block_spawn_positions]
+        # Spawn a new set of preview blocks from the pieces the core just dealt
+        self.preview_blocks = [
+            self.spawn_preview_block(pos, slot) for slot, pos in enumerate(self.block_spawn_positions)
+        ]
         self.placed_blocks = 0  # Reset the counter for the new set
+        self.hint = None
+        self.needs_game_over_check = True
 
     def update(self):
-        # Update logic for the active block
-        if self.active_block:
-            self.active_block.update()
-
-        # Check and clear full lines
-        self.clear_line.check_and_clear()
-
-        # Only check for game over if there are no active blocks and preview blocks exist
-        if not self.active_block and self.preview_blocks:
+        # The dragged block follows pointer events (see InputHandler). Lines are
+        # cleared when a block is placed, and the game over check only needs to
+        # run again after the grid or the preview set has changed
+        if not self.active_block and self.preview_blocks and self.needs_game_over_check:
             self.check_game_over()
+            if self.game_over:
+                return
+
+        # Keep the background solver on the current position and pick up its result
+        if self.hint_worker:
+            self.hint_worker.request(
+                self.board.occupancy, [piece.name if piece else None for piece in self.core.pieces]
+            )
+            self.hint = self.hint_worker.poll()
 
     def check_game_over(self):
-        # Check if any preview block can be placed on the grid
-        for block in self.preview_blocks:
-            for row in range(self.grid_size):
-                for col in range(self.grid_size):
-                    if self.can_place_block(block, col, row):
-                        # A valid move exists, so the game is not overI have no idea I have no idea what is going on 
-                        return  # At least one valid move exists, so the game is not over
+        # The core tracks whether any remaining piece can still be placed
+        self.needs_game_over_check = False
+        if not self.core.done:
+            return  # At least one valid move exists, so the game is not over
         print("No valid moves left. Game Over.")
         self.game_over = True  # No valid moves, game over
+        if self.hint_worker:
+            self.hint_worker.discard()  # Nothing polls for hints once the game is over
+            self.hint = None
+        if self.telemetry:
+            self.telemetry.event("game_over", score=self.core.score)
+            self.telemetry.session(self.core, True)
 
     def render(self):
-        self.screen.fill((0, 0, 0))  # Clear the screen
-        self.draw_grid()  # Draw the grid
+        # Dirty-rectangle rendering: only changed grid cells and the areas covered
+        # by moving sprites (old and new positions) are redrawn and pushed
+        changed_cells = self.draw_grid()
+        signature = self.sprite_signature()
+        if not changed_cells and signature == self.last_sprite_signature and not self.full_redraw:
+            self.input.frame_skipped()
+            return  # Nothing changed since the last frame
+
+        # Erase last frame's sprites and refresh changed cells from the grid layer
+        layer = self.grid_layer.surface
+        if self.full_redraw:
+            self.screen.blit(layer, (0, 0))
+        else:
+            for rect in self.sprite_rects + changed_cells:
+                self.screen.blit(layer, rect, rect)
 
         # Render preview blocks
-        for preview_block in self.preview_blocks:
-            preview_block.render(self.screen)
+        sprite_rects = self.render_preview_blocks()
 
         # Render the ghost block (if any)
         if self.active_block and self.active_block.dragging:
-            self.render_ghost_block(self.active_block)
+            ghost_rect = self.render_ghost_block(self.active_block)
+            if ghost_rect:
+                sprite_rects.append(ghost_rect)
+
+        # Highlight the suggested next placement while no block is held
+        if self.hint and not self.active_block and not self.game_over:
+            hint_rect = self.render_hint()
+            if hint_rect:
+                sprite_rects.append(hint_rect)
 
         # Render the active block (if any)
         if self.active_block:
-            self.active_block.render(self.screen)
+            sprite_rects.append(self.active_block.render(self.screen, self.tile_cache))
+
+        # Render the score
+        sprite_rects.append(self.render_score())
 
         # Render game over message
         if self.game_over:
-            self.render_game_over()
-
-        pygame.display.flip()
+            sprite_rects.append(self.render_game_over())
+
+        # Render the profiler overlay (if enabled)
+        if self.profiler:
+            sprite_rects.append(self.profiler.render_overlay(self.screen))
+
+        self.present(changed_cells, sprite_rects)
+        self.sprite_rects = sprite_rects
+        self.last_sprite_signature = signature
+
+    def render_preview_blocks(self):
+        return [preview_block.render(self.screen, self.tile_cache) for preview_block in self.preview_blocks]
+
+    def present(self, changed_cells, sprite_rects):
+        # Push this frame to the display: everything on the first frame, otherwise
+        # only changed cells and the old and new sprite areas
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+            if self.startup_time is None:
+                self.startup_time = time.perf_counter() - self.init_start
+        else:
+            pygame.display.update(self.sprite_rects + changed_cells + sprite_rects)
+        self.input.frame_presented()
+
+    def sprite_signature(self):
+        # Everything drawn on top of the grid layer; if this is unchanged and no
+        # cell changed, the frame is identical to the previous one
+        active = self.active_block
+        return (
+            tuple((block.slot, block.x, block.y, block.size) for block in self.preview_blocks),
+            (active.x, active.y, active.dragging) if active else None,
+            self.game_over,
+            self.core.score,
+            self.hint[0] if self.hint else None,
+            self.profiler.refresh_overlay() if self.profiler else None,
+        )
 
     def render_ghost_block(self, block):
-        # Calculate the ghost block's position on the grid
-        grid_x = (block.x - self.grid_x) // self.cell_size
-        grid_y = (block.y - self.grid_y) // self.cell_size
+        # Render the ghost block where it would snap, if it fits there
+        return self.ghost_renderer.render(self.screen, block, self.can_place_block)
+
+    def render_hint(self):
+        # Outline the cells where the solver's first move would place its piece
+        slot, row, col = self.hint[0]
+        piece = self.core.pieces[slot]
+        if piece is None:
+            return None  # The hinted piece was placed before the hint was refreshed
+        compiled = self.placement_index.compiled(piece.name)
+        for row_idx, col_idx in compiled.cells:
+            rect = pygame.Rect(
+                self.grid_x + (col + col_idx) * self.cell_size,
+                self.grid_y + (row + row_idx) * self.cell_size,
+                self.cell_size,
+                self.cell_size,
+            )
+            pygame.draw.rect(self.screen, HINT_COLOR, rect, 3)
+        return pygame.Rect(
+            self.grid_x + col * self.cell_size,
+            self.grid_y + row * self.cell_size,
+            compiled.width * self.cell_size,
+            compiled.height * self.cell_size,
+        )
 
-        # Check if the block fits on the grid
-        if not self.can_place_block(block, grid_x, grid_y):
-            return  # Don't render the ghost block if it doesn't fit
-
-        # Render the ghost block with reduced opacity
-        for row_idx, row in enumerate(block.shape):
-            for col_idx, cell in enumerate(row):
-                if cell:  # Only render filled cells
-                    rect = pygame.Rect(
-                        self.grid_x + (grid_x + col_idx) * self.cell_size,
-                        self.grid_y + (grid_y + row_idx) * self.cell_size,
-                        self.cell_size,
-                        self.cell_size,
-                    )
-                    # Render with higher opacity for debugging
-                    ghost_color = (*block.color[:3], 150)  # Increase alpha to 150 for better visibility
-                    surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-                    surface.fill(ghost_color)
-                    self.screen.blit(surface, rect.topleft)
+    def render_score(self):
+        text = self.assets.text(f"Score: {self.core.score}", 36, (255, 255, 255))
+        text_rect = text.get_rect(center=(self.screen_width // 2, self.grid_y // 2))
+        self.screen.blit(text, text_rect)
+        return text_rect
 
     def render_game_over(self):
-        font = pygame.font.Font(None, 74)
-        text = font.render("Game Over", True, (255, 0, 0))
+        text = self.assets.text("Game Over", 74, (255, 0, 0))
         text_rect = text.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
         self.screen.blit(text, text_rect)
+        return text_rect
 
     def can_place_block(self, block, grid_x, grid_y):
         # Check if the block can be placed at the given grid position
-        for row_idx, row in enumerate(block.shape):
-            for col_idx, cell in enumerate(row):
-                if cell:  # Only check filled cells
-                    grid_row = grid_y + row_idx
-                    grid_col = grid_x + col_idx
-                    if (
-                        grid_row < 0 or grid_row >= self.grid_size or  # Out of vertical bounds
-                        grid_col < 0 or grid_col >= self.grid_size or  # Out of horizontal bounds
-                        self.grid[grid_row][grid_col] != 0  # Cell already occupied
-                    ):
-                        return False  # Block doesn't fit
-        return True
+        mask = self.placement_index.mask_at(block.shape_name, grid_x, grid_y)
+        return mask is not None and self.board.can_place_mask(mask)
 
     def draw_grid(self):
-        for row in range(self.grid_size):
-            for col in range(self.grid_size):
-                rect = pygame.Rect(
-                    self.grid_x + col * self.cell_size,
-                    self.grid_y + row * self.cell_size,
-                    self.cell_size,
-                    self.cell_size,
-                )
-                if self.grid[row][col] != 0:  # Filled cell
-                    color = self.grid[row][col]
-
-                    # Shrink the block slightly to fit inside the grid cell
-                    inner_rect = rect.inflate(-4, -4)  # Reduce size by 4 pixels on each side
-                    render_3d_block(self.screen, inner_rect, color)
-                else:  # Empty cell
-                    pygame.draw.rect(self.screen, (50, 50, 50), rect)  # Dark gray for empty cells
-                pygame.draw.rect(self.screen, (255, 255, 255), rect, 1)  # Grid border
-
-    def is_mouse_on_block(self, block):
-        # Check if the mouse is over any part of the block
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        for row_idx, row in enumerate(block.shape):
-            for col_idx, cell in enumerate(row):
-                if cell:  # Only check filled cells
-                    cell_rect = pygame.Rect(
-                        block.x + col_idx * block.size,
-                        block.y + row_idx * block.size,
-                        block.size,
-                        block.size,
-                    )
-                    if cell_rect.collidepoint(mouse_x, mouse_y):
-                        return True
-        return False
+        # Bring the cached grid layer up to date; returns the rects of changed cells
+        return self.grid_layer.sync(self.board)
 
     def snap_to_grid(self, block):
         # Snap the block to the grid if it fits
@@ -242,27 +416,34 @@ class Game:
         grid_y = (block.y - self.grid_y) // self.cell_size
 
         # Check if the block fits within the grid
-        for row_idx, row in enumerate(block.shape):
-            for col_idx, cell in enumerate(row):
-                if cell:
-                    grid_row = grid_y + row_idx
-                    grid_col = grid_x + col_idx
-                    if (
-                        grid_row < 0 or grid_row >= self.grid_size or
-                        grid_col < 0 or grid_col >= self.grid_size or
-                        self.grid[grid_row][grid_col] != 0
-                    ):
-                        return False  # Block doesn't fit
-
-        # Place the block on the grid with its color
-        for row_idx, row in enumerate(block.shape):
-            for col_idx, cell in enumerate(row):
-                if cell:
-                    grid_row = grid_y + row_idx
-                    grid_col = grid_x + col_idx
-                    self.grid[grid_row][grid_col] = block.color  # Store the block's color
+        if not self.core.can_place(block.slot, grid_y, grid_x):
+            return False  # Block doesn't fit
+
+        # Place the block; the core clears completed lines and updates the score
+        self.core.step(block.slot, grid_y, grid_x)
+        if self.telemetry:
+            self.telemetry.placement(self.core, block.slot, block.shape_name, grid_y, grid_x)
 
         # Snap the block's position to the grid
         block.x = self.grid_x + grid_x * self.cell_size
         block.y = self.grid_y + grid_y * self.cell_size
-        return True
\ No newline at end of file
+        return True
+
+
+def coalesce_motion(events):
+    # Drop every MOUSEMOTION that is followed by another one before the next
+    # non-motion event: only the latest pointer position matters for a drag
+    coalesced = []
+    motion = None
+    for event in events:
+        if event.type == pygame.MOUSEMOTION:
+            motion = event
+            continue
+        if motion:
+            coalesced.append(motion)
+            motion = None
+        if event.type != pygame.NOEVENT:
+            coalesced.append(event)
+    if motion:
+        coalesced.append(motion)
+    return coalesced
@@ -1,48 +1,104 @@
-import pygame
-
-class InputHandler:
-    def __init__(self, blocks):
-        self.blocks = blocks
-
-    def handle_events(self, event):
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            for block in self.blocks:
-                is_on_block, row_idx, col_idx = self.is_mouse_on_block(block)
-                if is_on_block:
-                    block.dragging = True
-
-                    # Calculate the center of the clicked cell
-                    clicked_cell_center_x = block.x + col_idx * block.size + block.size // 2
-                    clicked_cell_center_y = block.y + row_idx * block.size + block.size // 2
-
-                    # Calculate the offset between the mouse and the center of the clicked cell
-                    block.offset_x = mouse_x - clicked_cell_center_x
-                    block.offset_y = mouse_y - clicked_cell_center_y
-
-                    break  # Only allow dragging one block at a time
-
-        elif event.type == pygame.MOUSEBUTTONUP:
-            for block in self.blocks:
-                if block.dragging:
-                    block.dragging = False
-                    # Reset the offset when dragging stops
-                    block.offset_x = 0
-                    block.offset_y = 0
-
-    def is_mouse_on_block(self, block):
-        # Check if the mouse is over any part of the block
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        for row_idx, row in enumerate(block.shape):
-            for col_idx, cell in enumerate(row):
-                if cell:  # Only check filled cells
-                    cell_rect = pygame.Rect(
-                        block.x + col_idx * block.size,
-                        block.y + row_idx * block.size,
-                        block.size,
-                        block.size
-                    )
-                    if cell_rect.collidepoint(mouse_x, mouse_y):
-                        # Return the clicked cell's row and column indices
-                        return True, row_idx, col_idx
-        return False, None, None
\ No newline at end of file
+import time
+from collections import deque
+
+import pygame
+from utils import percentile
+
+LATENCY_SAMPLES = 1000  # Input-to-display latencies kept for the summary
+
+
+class InputHandler:
+    # The single place where pointer events are turned into game actions.
+    # Hit-testing uses each block's bounding box followed by a bit lookup in
+    # the shape's precompiled cell mask, and dragging follows the positions
+    # carried by the events themselves rather than polling the mouse.
+    #
+    # The earliest time an input that changed the game can have been queued is
+    # kept until the next frame reaches the display, giving an input-to-display
+    # latency per frame. Events carry no timestamp, so the game loop reports
+    # when it last found the queue empty (see events_queued_after); queueing
+    # delay, including the frame-rate sleep, is therefore counted.
+
+    def __init__(self, game, catalog):
+        self.game = game
+        self.catalog = catalog
+        self.pending_input = None  # perf_counter() of the oldest unpresented input
+        self.events_since = None  # Lower bound on when the events being handled were queued
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def hit_test(self, block, x, y):
+        # (row, col) of the filled block cell under (x, y), or None
+        info = self.catalog.by_name[block.shape_name]
+        dx = x - block.x
+        dy = y - block.y
+        size = block.size
+        if not (0 <= dx < info.width * size and 0 <= dy < info.height * size):
+            return None
+        row = dy // size
+        col = dx // size
+        if (info.cell_mask >> (row * info.width + col)) & 1:
+            return row, col
+        return None
+
+    def block_at(self, blocks, x, y):
+        # Index of the first block with a filled cell under (x, y), or None
+        for index, block in enumerate(blocks):
+            if self.hit_test(block, x, y):
+                return index
+        return None
+
+    def handle_event(self, event):
+        game = self.game
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if game.active_block:
+                return
+            index = self.block_at(game.preview_blocks, *event.pos)
+            if index is not None:
+                game.pick_up_block(index, event.pos)
+                self.mark_input()
+
+        elif event.type == pygame.MOUSEMOTION:
+            block = game.active_block
+            if block and block.dragging:
+                self.drag_to(block, event.pos)
+                self.mark_input()
+
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            block = game.active_block
+            if block and block.dragging:
+                # Motion events may have been coalesced; the release position is final
+                self.drag_to(block, event.pos)
+                game.drop_active_block()
+                self.mark_input()
+
+    def drag_to(self, block, pos):
+        block.x = pos[0] - block.offset_x
+        block.y = pos[1] - block.offset_y
+
+    def events_queued_after(self, since):
+        # Called by the loop with each batch of events it is about to handle
+        self.events_since = since
+
+    def mark_input(self):
+        if self.pending_input is None:
+            # Events handled outside the loop have no bound; count from now
+            self.pending_input = self.events_since if self.events_since is not None else time.perf_counter()
+
+    def frame_presented(self):
+        # Called once a frame has been pushed to the display
+        if self.pending_input is not None:
+            self.latencies.append(time.perf_counter() - self.pending_input)
+            self.pending_input = None
+
+    def frame_skipped(self):
+        # The input did not change anything on screen; there is nothing to measure
+        self.pending_input = None
+
+    def latency_summary(self):
+        # Input-to-display latency percentiles in milliseconds
+        samples = sorted(self.latencies)
+        if not samples:
+            return {}
+        summary = {f"p{pct}": percentile(samples, pct) * 1000 for pct in (50, 95, 99)}
+        summary["samples"] = len(samples)
+        return summary
@@ -0,0 +1,123 @@
+# loadtest.py
+#
+# Load-test client for server.py: many concurrent clients each play complete
+# random games over the line-delimited JSON protocol, and the run reports
+# sessions handled, request throughput and request latency percentiles.
+#
+#   python src/loadtest.py --clients 50 --games 10 --port 7777
+#   python src/loadtest.py --clients 50 --games 10 --serve   # start a server in-process
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from server import DEFAULT_PORT, GameServer
+from utils import percentile
+
+LATENCY_PERCENTILES = (50, 90, 99)
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.next_id = 0
+        self.latencies = []
+
+    async def request(self, op, **fields):
+        # One request/response round trip; the latency is recorded per request
+        self.next_id += 1
+        fields.update(op=op, id=self.next_id)
+        start = time.perf_counter()
+        self.writer.write(json.dumps(fields, separators=(",", ":")).encode() + b"\n")
+        await self.writer.drain()
+        response = json.loads(await self.reader.readline())
+        self.latencies.append(time.perf_counter() - start)
+        if not response.get("ok"):
+            raise RuntimeError(f"{op} failed: {response.get('error')}")
+        return response
+
+    async def play(self, seed, rng):
+        # Play one game with random legal moves; returns the number of placements
+        session = (await self.request("new", seed=seed))["session"]
+        done = False
+        moves = 0
+        while not done:
+            legal = (await self.request("legal", session=session))["moves"]
+            piece, row, col = rng.choice(legal)
+            done = (await self.request("place", session=session, piece=piece, row=row, col=col))["state"]["done"]
+            moves += 1
+        await self.request("close", session=session)
+        return moves
+
+
+async def run_client(client_index, games, seed, connect):
+    reader, writer = await connect()
+    client = Client(reader, writer)
+    # Kept apart from the game seeds, so move choices don't track piece spawns
+    rng = random.Random(f"client:{seed}:{client_index}")
+    moves = 0
+    for game in range(games):
+        moves += await client.play(seed + client_index * games + game, rng)
+    writer.close()
+    await writer.wait_closed()
+    return client.latencies, moves
+
+
+async def run_load(clients, games, seed=0, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, serve=False):
+    server = None
+    if serve:
+        server = await GameServer().start(host, port, unix_path)
+        if not unix_path:
+            port = server.sockets[0].getsockname()[1]
+
+    def connect():
+        if unix_path:
+            return asyncio.open_unix_connection(unix_path)
+        return asyncio.open_connection(host, port)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_client(i, games, seed, connect) for i in range(clients)))
+    wall_time = time.perf_counter() - start
+    if server:
+        server.close()
+        await server.wait_closed()
+
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    moves = sum(client_moves for _, client_moves in results)
+    return {
+        "clients": clients,
+        "sessions": clients * games,
+        "placements": moves,
+        "requests": len(latencies),
+        "wall_time": wall_time,
+        "requests_per_second": len(latencies) / wall_time if wall_time else 0.0,
+        "latency_ms": {f"p{pct}": percentile(latencies, pct) * 1000 for pct in LATENCY_PERCENTILES},
+        "max_latency_ms": latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the headless Block Blast game server")
+    parser.add_argument("--clients", type=int, default=20, help="concurrent connections")
+    parser.add_argument("--games", type=int, default=5, help="games played per client")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None, help=f"server port (default {DEFAULT_PORT})")
+    parser.add_argument("--unix", metavar="PATH", help="connect to a Unix socket instead of TCP")
+    parser.add_argument("--serve", action="store_true",
+                        help="run the server in this process (on a free port unless --port/--unix is given)")
+    args = parser.parse_args(argv)
+
+    port = args.port
+    if port is None:
+        port = 0 if args.serve else DEFAULT_PORT
+    report = asyncio.run(run_load(args.clients, args.games, args.seed, args.host, port, args.unix, args.serve))
+    sys.stdout.write(json.dumps(report, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,76 @@
 # main.py
 
-import pygame
-from game import Game
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from game import MAX_GRID_SIZE, Game
+from profiler import FrameProfiler
+from replay import ReplayError, check_recordable
+from telemetry import TelemetrySink
+
+def grid_size(text):
+    size = int(text)
+    if not 1 <= size <= MAX_GRID_SIZE:
+        raise argparse.ArgumentTypeError(f"must be between 1 and {MAX_GRID_SIZE}")
+    return size
 
 def main():
-    pygame.init()
-    game = Game()
+    start = time.perf_counter()
+    parser = argparse.ArgumentParser(description="Block Blast")
+    parser.add_argument("--grid-size", type=grid_size, default=8, help="board width and height in cells")
+    parser.add_argument("--seed", type=int, default=None, help="seed the piece generator")
+    parser.add_argument("--hints", action="store_true", help="highlight the best next placement")
+    parser.add_argument("--profile", action="store_true", help="show frame-phase timings on screen")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace JSON on exit (implies --profile)")
+    parser.add_argument("--record", metavar="PATH", help="save a replay of the game on exit")
+    parser.add_argument("--telemetry", metavar="PATH", help="append session telemetry to this SQLite file")
+    args = parser.parse_args()
+    if args.record:
+        try:
+            check_recordable(args.seed, args.grid_size)
+        except ReplayError as e:
+            parser.error(str(e))
+
+    profiler = FrameProfiler() if args.profile or args.trace else None
+    telemetry = None
+    if args.telemetry:
+        try:
+            telemetry = TelemetrySink(args.telemetry)
+        except sqlite3.Error as e:
+            parser.error(f"cannot open telemetry database {args.telemetry}: {e}")
+
+    game = Game(
+        grid_size=args.grid_size,
+        seed=args.seed,
+        hints=args.hints,
+        profiler=profiler,
+        record=bool(args.record),
+        telemetry=telemetry,
+    )
     game.run()
 
+    if telemetry:
+        result = telemetry.close(game.core, game.game_over)
+        if result["unsaved"] or result["dropped"] or result["failed_flushes"]:
+            print(f"Telemetry was not fully saved: {json.dumps(result)}", file=sys.stderr)
+
+    if args.record:
+        game.core.replay.finish(game.core)
+        game.core.replay.save(args.record)
+
+    if args.trace:
+        profiler.export_trace(args.trace)
+    if profiler:
+        # Cold-start, text rendering and input-to-display latency
+        report = {
+            "startup_ms": (game.init_start - start + game.startup_time) * 1000 if game.startup_time else None,
+            "game_init_to_first_frame_ms": game.startup_time * 1000 if game.startup_time else None,
+            "assets": game.assets.stats(),
+            "input_latency_ms": game.input.latency_summary(),
+        }
+        print(json.dumps(report, indent=2))
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,26 +1,31 @@
 import pygame
 import random
+from shapes import NEON_COLORS
+from piece_generator import CATALOG
 
 class BlockObject:
-    def __init__(self, x, y, color, size, shape):
+    def __init__(self, x, y, color, size, shape, shape_name=None):
         self.x = x
         self.y = y
         self.color = color
         self.size = size  # Size of each cell in the block
         self.shape = shape  # 2D array representing the block's shape
+        self.shape_name = shape_name  # Shape name in the piece catalog
+        self.slot = None  # Index of the GameCore piece this block represents
         self.dragging = False
         self.placed = False  # Whether the block has been placed on the grid
-        self.offset_x = 0
+        self.offset_x = 0  # Pointer position relative to (x, y) while dragging
         self.offset_y = 0
 
-    def update(self):
-        if self.dragging:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            # Update the block's position using the offset
-            self.x = mouse_x - self.offset_x
-            self.y = mouse_y - self.offset_y
+    def bounding_rect(self):
+        # The bevel polygons reach one pixel past each cell's right/bottom edge
+        width = max(len(row) for row in self.shape)
+        return pygame.Rect(self.x, self.y, width * self.size + 1, len(self.shape) * self.size + 1)
 
-    def render(self, screen):
+    def render(self, screen, tiles=None):
+        # Draw the block and return the screen area it covers. With a TileCache,
+        # each cell is a single blit of a pre-baked tile.
+        tile = tiles.get(self.color, self.size) if tiles else None
         for row_idx, row in enumerate(self.shape):
             for col_idx, cell in enumerate(row):
                 if cell:  # Only render filled cells
@@ -30,14 +35,19 @@ class BlockObject:
                         self.size,
                         self.size,
                     )
-                    render_3d_block(screen, rect, self.color)
+                    if tile:
+                        screen.blit(tile, rect)
+                    else:
+                        render_3d_block(screen, rect, self.color)
+        return self.bounding_rect()
 
 def render_3d_block(screen, rect, color):
     # Base color
     pygame.draw.rect(screen, color, rect)
 
     # Add exaggerated 3D effect
-    inner_rect = rect.inflate(-8, -8)  # Smaller inner square
+    bevel = 8 if min(rect.width, rect.height) >= 16 else min(rect.width, rect.height) // 2  # Thinner on tiny cells
+    inner_rect = rect.inflate(-bevel, -bevel)  # Smaller inner square
     light_color = tuple(min(c + 80, 255) for c in color[:3])  # Much lighter shade
     dark_color = tuple(max(c - 80, 0) for c in color[:3])  # Much darker shade
     side_color = tuple((light_color[i] + dark_color[i]) // 2 for i in range(3))  # Mid-tone for sides
@@ -74,87 +84,15 @@ def render_3d_block(screen, rect, color):
         inner_rect.topright
     ])
 
-# Block templates
-BLOCK_SHAPES = {
-
-    "3x3_block": [[1, 1, 1], [1, 1, 1], [1, 1, 1]],
-    "2x2_block": [[1, 1], [1, 1]],
-    "1x1_block": [[1]],
-
-    "2x3_horizontal": [[1, 1, 1], [1, 1, 1]],
-    "2x3_vertical": [[1, 1], [1, 1], [1, 1]],
-
-    "T_block": [[0, 1, 0], [1, 1, 1]],
-    "T_block_upside_down": [[1, 1, 1], [0, 1, 0]],
-    "T_block_left": [[1, 0], [1, 1], [1, 0]],
-    "T_block_right": [[0, 1], [1, 1], [0, 1]],
-
-
-    "L_block_right": [[1, 0], [1, 0], [1, 1]],
-    "L_block__right_one_rotation": [[1, 1, 1], [1, 0, 0]],
-    "L_block_right_two_rotation": [[1, 1], [0, 1], [0, 1]],
-    "L_block_right_three_rotation": [[1, 1], [1, 0], [1, 0]],
-
-
-
-
-    "L_large_block": [[1, 1, 1], [1, 0, 0], [1, 0, 0]],
-    "L_large_block_one_rotation": [[1, 1, 1], [0, 0, 1], [0, 0, 1]],
-    "L_large_block_two_rotation": [[0, 0, 1], [0, 0, 1], [1, 1, 1]],
-    "L_large_block_three_rotation": [[1, 0, 0], [1, 0, 0], [1, 1, 1]],
-
-
-
-    "corner_left": [[1, 1], [0, 1]],
-    "corner_right": [[1, 0], [1, 1]],
-    "corner_left_upside_down": [[0, 1], [1, 1]],
-    "corner_right_upside_down": [[1, 1], [1, 0]],
-
-    "z_block": [[1, 1, 0], [0, 1, 1]],
-    "z_block_one_rotation": [[0, 1], [1, 1], [1, 0]],
-    "z_block_two_rotation": [[1, 0], [1, 1], [0, 1]],
-
-    "s_block": [[0, 1, 1], [1, 1, 0]],
-    "s_block_one_rotation": [[1, 0], [1, 1], [0, 1]],
-    "s_block_two_rotation": [[1, 1, 0], [0, 1, 1]],
-
-
-    "1x5_horizontal": [[1, 1, 1, 1, 1]],
-    "1x4_horizontal": [[1, 1, 1, 1]],
-    "1x3_horizontal": [[1, 1, 1]],
-    "1x2_horizontal": [[1, 1]],
-
-    "1x5_vertical": [[1], [1], [1], [1], [1]],
-    "1x4_vertical": [[1], [1], [1], [1]],
-    "1x3_vertical": [[1], [1], [1]],
-    "1x2_vertical": [[1], [1]],
-
-
-
-}
-
-def spawn_random_block(x, y, preview=False):
-    # Predefined neon colors
-    NEON_COLORS = [
-        (255, 0, 255),  # Magenta
-        (0, 255, 255),  # Cyan
-        (255, 255, 0),  # Yellow
-        (255, 0, 0),    # Bright Red
-        (0, 255, 0),    # Bright Green
-        (0, 0, 255),    # Bright Blue
-        (255, 128, 0),  # Neon Orange
-        (128, 0, 255),  # Neon Purple
-    ]
-
-    # Randomly select a block shape
-    shape_name = random.choice(list(BLOCK_SHAPES.keys()))
-    shape = BLOCK_SHAPES[shape_name]
+def spawn_random_block(x, y, preview=False, rng=random):
+    # Randomly select a block shape from the precompiled, de-duplicated catalog
+    info = CATALOG.random_shape(rng)
 
     # Randomly select a neon color
-    color = random.choice(NEON_COLORS)
+    color = rng.choice(NEON_COLORS)
 
     # Adjust size for preview blocks
     size = 25 if preview else 50
 
     # Create and return the block object
-    return BlockObject(x, y, color, size, shape)
\ No newline at end of file
+    return BlockObject(x, y, color, size, info.shape, info.name)
\ No newline at end of file
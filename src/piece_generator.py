@@ -0,0 +1,178 @@
+import random
+from shapes import BLOCK_SHAPES
+
+PIECES_PER_SET = 3
+PLACEABLE_RETRIES = 8  # Fresh sets tried before forcing a placeable piece in
+
+
+class ShapeInfo:
+    __slots__ = ("id", "name", "shape", "cells", "width", "height", "cell_mask")
+
+    def __init__(self, shape_id, name, shape):
+        self.id = shape_id
+        self.name = name
+        self.shape = shape
+        self.cells = tuple(
+            (row_idx, col_idx)
+            for row_idx, row in enumerate(shape)
+            for col_idx, cell in enumerate(row)
+            if cell
+        )
+        self.height = len(shape)
+        self.width = max(len(row) for row in shape)
+        # Filled cells as bits (row * width + col), for O(1) hit-testing
+        self.cell_mask = sum(1 << (row * self.width + col) for row, col in self.cells)
+
+
+class AliasSampler:
+    # Walker/Vose alias method: O(n) setup, O(1) per weighted sample
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        if count == 0 or total <= 0:
+            raise ValueError("AliasSampler needs at least one positive weight")
+        scaled = [weight * count / total for weight in weights]
+        self.count = count
+        self.prob = [1.0] * count
+        self.alias = list(range(count))
+
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            low = small.pop()
+            high = large.pop()
+            self.prob[low] = scaled[low]
+            self.alias[low] = high
+            scaled[high] -= 1.0 - scaled[low]
+            (small if scaled[high] < 1.0 else large).append(high)
+
+    def sample(self, rng):
+        i = int(rng.random() * self.count)
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+    def sample_many(self, rng, count):
+        return [self.sample(rng) for _ in range(count)]
+
+
+class ShapeCatalog:
+    # Immutable, precompiled shape table. Exact duplicate shapes are folded into
+    # the first entry with the same cells so the distribution is not silently
+    # skewed towards them.
+
+    def __init__(self, shapes=BLOCK_SHAPES, weights=None):
+        seen = set()
+        infos = []
+        for name, shape in shapes.items():
+            key = tuple(tuple(row) for row in shape)
+            if key in seen:
+                continue
+            seen.add(key)
+            infos.append(ShapeInfo(len(infos), name, key))
+
+        self.shapes = tuple(infos)
+        self.names = tuple(info.name for info in infos)
+        self.by_name = {info.name: info for info in infos}
+        self.shape_dict = {info.name: [list(row) for row in info.shape] for info in infos}
+        weights = weights or {}
+        self.weights = tuple(weights.get(name, 1.0) for name in self.names)
+        self.sampler = AliasSampler(self.weights)
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def random_shape(self, rng=random):
+        return self.shapes[self.sampler.sample(rng)]
+
+
+CATALOG = ShapeCatalog()
+
+
+class WeightedGenerator:
+    # Independent weighted draws (uniform unless the catalog has weights)
+
+    def __init__(self, catalog, rng):
+        self.catalog = catalog
+        self.rng = rng
+
+    def reset(self):
+        pass
+
+    def generate(self, count):
+        # Batch of shape ids for simulations
+        return self.catalog.sampler.sample_many(self.rng, count)
+
+    def next_set(self, occupancy=None):
+        return self.generate(PIECES_PER_SET)
+
+
+class BagGenerator(WeightedGenerator):
+    # Deal every shape once (in shuffled order) before any shape repeats
+
+    def __init__(self, catalog, rng):
+        super().__init__(catalog, rng)
+        self.bag = []
+
+    def reset(self):
+        self.bag = []
+
+    def generate(self, count):
+        ids = []
+        while len(ids) < count:
+            if not self.bag:
+                self.bag = list(range(len(self.catalog)))
+                self.rng.shuffle(self.bag)
+            ids.append(self.bag.pop())
+        return ids
+
+
+class PlaceableGenerator:
+    # Wraps another generator and guarantees that at least one piece of each
+    # set fits on the current board, using the placement index's cached checks
+
+    def __init__(self, base, placement_index):
+        self.base = base
+        self.catalog = base.catalog
+        self.rng = base.rng
+        self.placement_index = placement_index
+
+    def reset(self):
+        self.base.reset()
+
+    def generate(self, count):
+        return self.base.generate(count)
+
+    def fits(self, shape_id, occupancy):
+        return self.placement_index.can_place_anywhere(self.catalog.names[shape_id], occupancy)
+
+    def next_set(self, occupancy=None):
+        ids = self.base.next_set(occupancy)
+        if occupancy is None:
+            return ids
+        for _ in range(PLACEABLE_RETRIES):
+            if any(self.fits(shape_id, occupancy) for shape_id in ids):
+                return ids
+            ids = self.base.next_set(occupancy)
+
+        # Still stuck: swap one piece for a random shape that fits, if any does
+        placeable = [shape_id for shape_id in range(len(self.catalog)) if self.fits(shape_id, occupancy)]
+        if placeable:
+            ids[self.rng.randrange(len(ids))] = self.rng.choice(placeable)
+        return ids
+
+
+GENERATORS = {
+    "weighted": lambda catalog, rng, index: WeightedGenerator(catalog, rng),
+    "bag": lambda catalog, rng, index: BagGenerator(catalog, rng),
+    "placeable": lambda catalog, rng, index: PlaceableGenerator(WeightedGenerator(catalog, rng), index),
+    "placeable-bag": lambda catalog, rng, index: PlaceableGenerator(BagGenerator(catalog, rng), index),
+}
+
+
+def make_generator(strategy, catalog, rng, placement_index):
+    # Build a generator by name, or pass through an already built one
+    if not isinstance(strategy, str):
+        return strategy
+    if strategy not in GENERATORS:
+        raise ValueError(f"Unknown piece generator {strategy!r}; use one of {sorted(GENERATORS)}")
+    return GENERATORS[strategy](catalog, rng, placement_index)
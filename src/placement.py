@@ -0,0 +1,103 @@
+from functools import cached_property
+
+
+class CompiledShape:
+    # A block shape precompiled against a board size: its filled-cell offsets,
+    # its mask at origin (0, 0) and a bitboard of every origin where it stays on
+    # the board. Masks at other origins are the base mask shifted, so nothing
+    # per-origin needs to be stored, which keeps large boards cheap.
+
+    def __init__(self, name, shape, board_size):
+        self.name = name
+        self.shape = shape
+        self.board_size = board_size
+        self.height = len(shape)
+        self.width = max(len(row) for row in shape)
+        self.cells = tuple(
+            (row_idx, col_idx)
+            for row_idx, row in enumerate(shape)
+            for col_idx, cell in enumerate(row)
+            if cell
+        )
+        self.offsets = tuple(row_idx * board_size + col_idx for row_idx, col_idx in self.cells)
+        self.base_mask = sum(1 << offset for offset in self.offsets)
+        self.full_mask = (1 << (board_size * board_size)) - 1
+
+        # Bit (grid_y * size + grid_x) is set for every in-bounds origin
+        max_x = board_size - self.width
+        max_y = board_size - self.height
+        self.valid_origins = 0
+        if max_x >= 0 and max_y >= 0:
+            row_origins = (1 << (max_x + 1)) - 1
+            for grid_y in range(max_y + 1):
+                self.valid_origins |= row_origins << (grid_y * board_size)
+
+    @cached_property
+    def origins(self):
+        # (grid_x, grid_y) -> mask for every in-bounds origin; built on first use
+        origins = {}
+        bits = self.valid_origins
+        while bits:
+            low = bits & -bits
+            origin = low.bit_length() - 1
+            origins[(origin % self.board_size, origin // self.board_size)] = self.base_mask << origin
+            bits ^= low
+        return origins
+
+    def mask_at(self, grid_x, grid_y):
+        # Return the mask for this origin, or None if the shape would leave the board
+        if 0 <= grid_x <= self.board_size - self.width and 0 <= grid_y <= self.board_size - self.height:
+            return self.base_mask << (grid_y * self.board_size + grid_x)
+        return None
+
+    def placeable_origins(self, occupancy):
+        # Bitboard of origins where the shape fits: an origin survives only if the
+        # cell at each of the shape's offsets from it is free (one shift-AND per cell)
+        free = self.full_mask & ~occupancy
+        origins = self.valid_origins
+        for offset in self.offsets:
+            origins &= free >> offset
+            if not origins:
+                break
+        return origins
+
+    def fits_anywhere(self, occupancy):
+        return self.placeable_origins(occupancy) != 0
+
+    def legal_origins(self, occupancy):
+        origins = []
+        bits = self.placeable_origins(occupancy)
+        while bits:
+            low = bits & -bits
+            origin = low.bit_length() - 1
+            origins.append((origin % self.board_size, origin // self.board_size))
+            bits ^= low
+        return origins
+
+
+class PlacementIndex:
+    def __init__(self, shapes, board_size=8):
+        self.board_size = board_size
+        self.shapes = {
+            name: CompiledShape(name, shape, board_size) for name, shape in shapes.items()
+        }
+
+        # Cache of shape name -> "can still be placed", valid for cached_occupancy
+        self.cached_occupancy = None
+        self.placeable = {}
+
+    def compiled(self, name):
+        return self.shapes[name]
+
+    def mask_at(self, name, grid_x, grid_y):
+        return self.shapes[name].mask_at(grid_x, grid_y)
+
+    def can_place_anywhere(self, name, occupancy):
+        # Cached lookup; the cache is dropped whenever the occupancy changes
+        if occupancy != self.cached_occupancy:
+            self.placeable.clear()
+            self.cached_occupancy = occupancy
+        result = self.placeable.get(name)
+        if result is None:
+            result = self.placeable[name] = self.shapes[name].fits_anywhere(occupancy)
+        return result
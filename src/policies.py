@@ -0,0 +1,45 @@
+import importlib
+
+# A placement policy is any callable policy(core, rng) -> (piece_index, row, col)
+# that picks one of core.legal_moves(). core is a GameCore and rng a random.Random.
+
+
+def random_policy(core, rng):
+    return rng.choice(core.legal_moves())
+
+
+def greedy_policy(core, rng):
+    # Prefer the move that clears the most lines, then the largest piece;
+    # ties are broken randomly
+    board = core.board
+    best_key = None
+    best_moves = []
+    for piece_index, row, col in core.legal_moves():
+        compiled = core.placement_index.compiled(core.pieces[piece_index].name)
+        mask = compiled.mask_at(col, row)
+        _, lines = board.full_lines(
+            board.occupancy | mask, range(row, row + compiled.height), range(col, col + compiled.width)
+        )
+        key = (lines, len(compiled.cells))
+        if best_key is None or key > best_key:
+            best_key = key
+            best_moves = [(piece_index, row, col)]
+        elif key == best_key:
+            best_moves.append((piece_index, row, col))
+    return rng.choice(best_moves)
+
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+}
+
+
+def load_policy(spec):
+    # Resolve a built-in policy name or a "module:function" import path
+    if spec in POLICIES:
+        return POLICIES[spec]
+    module_name, sep, attr = spec.partition(":")
+    if not sep:
+        raise ValueError(f"Unknown policy {spec!r}; use one of {sorted(POLICIES)} or module:function")
+    return getattr(importlib.import_module(module_name), attr)
@@ -0,0 +1,152 @@
+import os
+import struct
+
+import numpy as np
+from shapes import NEON_COLORS
+
+MAGIC = b"BBPA"
+VERSION = 2  # 2: shape ids index the de-duplicated piece catalog
+HEADER = struct.Struct("<4sHHI4x")  # magic, version, grid size, record size (16 bytes)
+UNKNOWN_COLOR = 255  # Colour index for colours outside NEON_COLORS
+PREVIEW_SLOTS = 3
+
+
+def position_dtype(grid_size=8):
+    # Fixed-width position record. Occupancy is a uint64 bitboard for boards up
+    # to 8x8 and a little-endian byte string for larger ones. Colours are
+    # 1 + index into NEON_COLORS (0 = empty); preview shape ids are -1 once placed.
+    cells = grid_size * grid_size
+    occupancy = ("occupancy", "<u8") if cells <= 64 else ("occupancy", "u1", ((cells + 7) // 8,))
+    return np.dtype([
+        occupancy,
+        ("colors", "u1", (cells,)),
+        ("preview", "i1", (PREVIEW_SLOTS,)),
+        ("score", "<u4"),
+        ("move", "<u4"),
+    ])
+
+
+class PositionWriter:
+    # Buffers position snapshots and appends them to the archive in batches.
+    # Attach it to a GameCore to record a snapshot after every placement.
+
+    def __init__(self, path, grid_size=8, batch_size=4096):
+        self.path = path
+        self.grid_size = grid_size
+        self.dtype = position_dtype(grid_size)
+        self.buffer = np.zeros(batch_size, dtype=self.dtype)
+        self.count = 0
+        self.color_tables = {}
+
+        if os.path.exists(path) and os.path.getsize(path):
+            read_header(path, grid_size)
+        else:
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, grid_size, self.dtype.itemsize))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def attach(self, core):
+        core.on_step.append(self.append)
+
+    def color_table(self, board):
+        # bytes.translate table from the board's palette ids to archive colour ids
+        key = tuple(board.palette)
+        table = self.color_tables.get(key)
+        if table is None:
+            table = bytearray(range(256))
+            for palette_id, color in enumerate(board.palette[1:], 1):
+                table[palette_id] = NEON_COLORS.index(color) + 1 if color in NEON_COLORS else UNKNOWN_COLOR
+            table = self.color_tables[key] = bytes(table)
+        return table
+
+    def append(self, core):
+        board = core.board
+        record = self.buffer[self.count]
+        if self.dtype["occupancy"].shape:
+            record["occupancy"] = np.frombuffer(
+                board.occupancy.to_bytes(self.dtype["occupancy"].shape[0], "little"), dtype=np.uint8
+            )
+        else:
+            record["occupancy"] = board.occupancy
+        record["colors"] = np.frombuffer(board.colors.translate(self.color_table(board)), dtype=np.uint8)
+        record["preview"] = [core.shape_ids[piece.name] if piece else -1 for piece in core.pieces]
+        record["score"] = core.score
+        record["move"] = core.moves
+        self.count += 1
+        if self.count == len(self.buffer):
+            self.flush()
+
+    def flush(self):
+        if self.count:
+            with open(self.path, "ab") as f:
+                f.write(self.buffer[:self.count].tobytes())
+            self.count = 0
+
+    def close(self):
+        self.flush()
+
+
+def read_header(path, grid_size=None):
+    with open(path, "rb") as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        raise ValueError(f"{path}: too short for a position archive header")
+    magic, version, file_grid_size, record_size = HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a position archive")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported archive version {version}")
+    if grid_size is not None and file_grid_size != grid_size:
+        raise ValueError(f"{path}: archive grid size {file_grid_size} does not match {grid_size}")
+    if record_size != position_dtype(file_grid_size).itemsize:
+        raise ValueError(f"{path}: unexpected record size {record_size}")
+    return file_grid_size
+
+
+class PositionArchive:
+    # Read-only, memory-mapped view of an archive. Indexing and slicing return
+    # NumPy record arrays backed directly by the file (no copy); boolean
+    # filtering copies only the matching records.
+
+    def __init__(self, path):
+        self.path = path
+        self.grid_size = read_header(path)
+        self.dtype = position_dtype(self.grid_size)
+        count = (os.path.getsize(path) - HEADER.size) // self.dtype.itemsize
+        if count:
+            records = np.memmap(path, dtype=self.dtype, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            records = np.zeros(0, dtype=self.dtype)
+        self.records = records.view(np.recarray)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def iter_batches(self, batch_size=65536):
+        for start in range(0, len(self.records), batch_size):
+            yield self.records[start:start + batch_size]
+
+    def filter(self, predicate, batch_size=65536):
+        # Concatenate the records for which predicate(batch) -> bool mask is true
+        parts = [batch[predicate(batch)] for batch in self.iter_batches(batch_size)]
+        if not parts:
+            return self.records[:0]
+        return np.concatenate(parts).view(np.recarray)
+
+    def filled_cells(self, records=None):
+        # Number of occupied cells per record
+        records = self.records if records is None else records
+        return (np.asarray(records["colors"]) != 0).sum(axis=1)
+
+    def boards(self, records=None):
+        # Occupied cells as an (n, size, size) bool array
+        records = self.records if records is None else records
+        return (np.asarray(records["colors"]) != 0).reshape(-1, self.grid_size, self.grid_size)
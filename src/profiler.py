@@ -0,0 +1,158 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+
+import pygame
+import object as object_module
+import render_cache
+from utils import percentile
+
+OVERLAY_PERCENTILES = (50, 95, 99)
+OVERLAY_REFRESH = 0.5  # Seconds between overlay text updates
+OVERLAY_POSITION = (8, 8)
+OVERLAY_COLOR = (0, 255, 0)
+OVERLAY_BACKGROUND = (0, 0, 0)
+OVERLAY_FONT_SIZE = 20
+
+# Game methods timed as frame phases; nested calls show up nested in the trace
+TIMED_METHODS = {
+    "pump_events": "events",
+    "update": "update",
+    "check_game_over": "check_game_over",
+    "render": "render",
+    "draw_grid": "draw_grid",
+    "render_preview_blocks": "preview_blocks",
+    "render_ghost_block": "ghost",
+    "present": "flip",
+}
+
+
+class FrameProfiler:
+    # Opt-in per-frame phase timing. instrument() wraps the hot Game methods so
+    # an uninstrumented game pays nothing; timings feed an on-screen overlay
+    # (p50/p95/p99 frame time) and a Chrome trace (chrome://tracing, Perfetto).
+
+    def __init__(self, window=600, max_trace_events=200000):
+        self.frame_times = deque(maxlen=window)  # Seconds of work per frame
+        self.trace_events = deque(maxlen=max_trace_events)
+        self.phase_totals = defaultdict(float)  # Current frame, seconds per phase
+        self.counters = defaultdict(int)  # Current frame, calls per counted function
+        self.last_phases = {}
+        self.last_counters = {}
+        self.frame_start = None
+        self.frame_number = 0
+        self.epoch = time.perf_counter()
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+
+        self.assets = None
+        self.overlay_lines = []
+        self.overlay_surfaces = []
+        self.overlay_updated = 0.0
+        self.overlay_version = 0
+
+    def instrument(self, game):
+        self.assets = game.assets
+        for method, phase in TIMED_METHODS.items():
+            setattr(game, method, self.timed(getattr(game, method), phase))
+        game.clear_line.check_and_clear = self.timed(game.clear_line.check_and_clear, "check_and_clear")
+        game.can_place_block = self.counted(game.can_place_block, "can_place_block")
+        # render_3d_block is looked up as a module global by its callers
+        for module in (object_module, render_cache):
+            module.render_3d_block = self.counted(module.render_3d_block, "render_3d_block")
+
+    def timed(self, func, phase):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                self.phase_totals[phase] += end - start
+                self.trace_events.append((phase, start, end - start))
+        return wrapper
+
+    def counted(self, func, name):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.counters[name] += 1
+            return func(*args, **kwargs)
+        return wrapper
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        end = time.perf_counter()
+        if self.frame_start is not None:
+            duration = end - self.frame_start
+            self.frame_times.append(duration)
+            self.trace_events.append(("frame", self.frame_start, duration))
+        self.last_phases = dict(self.phase_totals)
+        self.last_counters = dict(self.counters)
+        for name, value in self.counters.items():
+            self.trace_events.append(("counter:" + name, end, value))
+        self.phase_totals.clear()
+        self.counters.clear()
+        self.frame_number += 1
+
+    def summary(self):
+        # Frame-time percentiles in milliseconds over the rolling window
+        times = sorted(self.frame_times)
+        return {f"p{pct}": percentile(times, pct) * 1000 for pct in OVERLAY_PERCENTILES}
+
+    def refresh_overlay(self):
+        # Re-render the overlay text at most every OVERLAY_REFRESH seconds and
+        # return a version number that changes whenever the text does
+        now = time.perf_counter()
+        if now - self.overlay_updated >= OVERLAY_REFRESH:
+            self.overlay_updated = now
+            self.update_overlay()
+        return self.overlay_version
+
+    def render_overlay(self, screen):
+        x, y = OVERLAY_POSITION
+        rect = pygame.Rect(x, y, 0, 0)
+        for surface in self.overlay_surfaces:
+            rect.union_ip(screen.blit(surface, (x, y)))
+            y += surface.get_height()
+        return rect
+
+    def update_overlay(self):
+        stats = self.summary()
+        lines = ["frame " + "  ".join(f"{name} {value:.2f}ms" for name, value in stats.items())]
+        lines += [f"{phase}: {seconds * 1000:.2f}ms" for phase, seconds in sorted(self.last_phases.items())]
+        lines += [f"{name}: {count}/frame" for name, count in sorted(self.last_counters.items())]
+        text_stats = self.assets.stats()
+        lines.append(
+            f"text cache: {text_stats['text_hits']} hits, {text_stats['text_misses']} misses, "
+            f"{text_stats['text_render_ms']:.1f}ms rendering"
+        )
+        if lines != self.overlay_lines:
+            self.overlay_lines = lines
+            self.overlay_surfaces = [
+                self.assets.text(line, OVERLAY_FONT_SIZE, OVERLAY_COLOR, OVERLAY_BACKGROUND) for line in lines
+            ]
+            self.overlay_version += 1
+
+    def export_trace(self, path):
+        # Write the recorded events in Chrome's trace event JSON format
+        events = []
+        for name, start, value in self.trace_events:
+            timestamp = (start - self.epoch) * 1e6
+            if name.startswith("counter:"):
+                events.append({
+                    "name": name[len("counter:"):], "ph": "C", "ts": timestamp,
+                    "pid": self.pid, "tid": self.tid, "args": {"calls": value},
+                })
+            else:
+                events.append({
+                    "name": name, "ph": "X", "ts": timestamp, "dur": value * 1e6,
+                    "pid": self.pid, "tid": self.tid,
+                })
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,171 @@
+import pygame
+from object import render_3d_block
+
+EMPTY_CELL_COLOR = (50, 50, 50)  # Dark gray for empty cells
+GRID_BORDER_COLOR = (255, 255, 255)
+BACKGROUND_COLOR = (0, 0, 0)
+GHOST_ALPHA = 150  # Ghost preview opacity
+TILES_PER_PAGE = 16  # Tiles of one size packed into each atlas page
+
+
+class TileCache:
+    # Pre-baked bevelled block tiles keyed by (color, size). Tiles of one size
+    # are packed side by side into shared atlas pages; each tile handed out is a
+    # subsurface of its page, so callers blit it like any other surface.
+
+    def __init__(self, tiles_per_page=TILES_PER_PAGE):
+        self.tiles_per_page = tiles_per_page
+        self.tiles = {}
+        self.pages = {}  # size -> [(page surface, tiles used)]
+
+    def get(self, color, size):
+        key = (color, size)
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.tiles[key] = self.bake(color, size)
+        return tile
+
+    def bake(self, color, size):
+        # The bevel polygons touch the rect's right/bottom edge coordinates,
+        # so each slot has one extra pixel of (transparent) margin to match direct drawing
+        slot_size = size + 1
+        pages = self.pages.setdefault(size, [])
+        if not pages or pages[-1][1] == self.tiles_per_page:
+            page = pygame.Surface((slot_size * self.tiles_per_page, slot_size), pygame.SRCALPHA).convert_alpha()
+            pages.append([page, 0])
+        page_entry = pages[-1]
+        page, used = page_entry
+        page_entry[1] += 1
+        tile = page.subsurface(pygame.Rect(used * slot_size, 0, slot_size, slot_size))
+        render_3d_block(tile, pygame.Rect(0, 0, size, size), color)
+        return tile
+
+
+class GridLayer:
+    # The board drawn once onto a cached static background, then kept up to date
+    # by redrawing only the cells whose colour changed since the last sync
+
+    def __init__(self, screen_size, grid_x, grid_y, grid_size, cell_size, tiles):
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.grid_size = grid_size
+        self.cell_size = cell_size
+        self.tiles = tiles
+        # Gap between a block and its cell border, scaled with the cell size
+        self.inset = max(2, 2 * (cell_size // 25))
+
+        # Static background: black screen with the empty grid
+        self.background = pygame.Surface(screen_size).convert()
+        self.background.fill(BACKGROUND_COLOR)
+        for row in range(grid_size):
+            for col in range(grid_size):
+                rect = self.cell_rect(row, col)
+                pygame.draw.rect(self.background, EMPTY_CELL_COLOR, rect)
+                pygame.draw.rect(self.background, GRID_BORDER_COLOR, rect, 1)
+
+        self.surface = self.background.copy()
+        self.drawn = bytearray(grid_size * grid_size)  # Palette ids currently drawn
+
+    def cell_rect(self, row, col):
+        return pygame.Rect(
+            self.grid_x + col * self.cell_size,
+            self.grid_y + row * self.cell_size,
+            self.cell_size,
+            self.cell_size,
+        )
+
+    def changed_cells(self, colors):
+        # Indices whose colour differs from what is drawn. XOR-ing the two colour
+        # arrays as integers finds them without a per-cell Python loop.
+        diff = int.from_bytes(colors, "little") ^ int.from_bytes(self.drawn, "little")
+        indices = []
+        while diff:
+            index = ((diff & -diff).bit_length() - 1) >> 3
+            indices.append(index)
+            diff &= ~(0xFF << (index * 8))
+        return indices
+
+    def sync(self, board):
+        # Redraw changed cells onto the layer and return their rects
+        colors = board.colors
+        if colors == self.drawn:
+            return []
+        changed = []
+        for index in self.changed_cells(colors):
+            new = colors[index]
+            row, col = divmod(index, self.grid_size)
+            rect = self.cell_rect(row, col)
+            if new:
+                # Filled cells show the block over black, inside the grid border
+                self.surface.fill(BACKGROUND_COLOR, rect)
+                inner_rect = rect.inflate(-self.inset, -self.inset)  # Shrink the block to fit inside the cell
+                tile = self.tiles.get(board.palette[new], inner_rect.width)
+                self.surface.blit(tile, inner_rect)
+                pygame.draw.rect(self.surface, GRID_BORDER_COLOR, rect, 1)
+            else:
+                self.surface.blit(self.background, rect, rect)
+            changed.append(rect)
+        self.drawn[:] = colors
+        return changed
+
+
+class GhostRenderer:
+    # Placement preview for the dragged block. One translucent surface is
+    # composited per (shape, colour) and blitted in a single call, and legality
+    # is only re-checked when the snapped grid coordinate (or the board) changes.
+
+    def __init__(self, board, grid_x, grid_y, cell_size, alpha=GHOST_ALPHA):
+        self.board = board
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.cell_size = cell_size
+        self.alpha = alpha
+        self.surfaces = {}
+        self.last_key = None
+        self.last_rect = None
+
+    def ghost_surface(self, block):
+        key = (block.shape_name, block.color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            width = max(len(row) for row in block.shape)
+            surface = pygame.Surface(
+                (width * self.cell_size, len(block.shape) * self.cell_size), pygame.SRCALPHA
+            )
+            ghost_color = (*block.color[:3], self.alpha)
+            for row_idx, row in enumerate(block.shape):
+                for col_idx, cell in enumerate(row):
+                    if cell:
+                        surface.fill(ghost_color, (
+                            col_idx * self.cell_size,
+                            row_idx * self.cell_size,
+                            self.cell_size,
+                            self.cell_size,
+                        ))
+            self.surfaces[key] = surface
+        return surface
+
+    def placement(self, block, can_place):
+        # Return the snapped screen rect for the ghost, or None if it doesn't fit
+        grid_x = (block.x - self.grid_x) // self.cell_size
+        grid_y = (block.y - self.grid_y) // self.cell_size
+        key = (block.shape_name, grid_x, grid_y, self.board.occupancy)
+        if key != self.last_key:
+            self.last_key = key
+            if can_place(block, grid_x, grid_y):
+                width = max(len(row) for row in block.shape)
+                self.last_rect = pygame.Rect(
+                    self.grid_x + grid_x * self.cell_size,
+                    self.grid_y + grid_y * self.cell_size,
+                    width * self.cell_size,
+                    len(block.shape) * self.cell_size,
+                )
+            else:
+                self.last_rect = None
+        return self.last_rect
+
+    def render(self, screen, block, can_place):
+        rect = self.placement(block, can_place)
+        if rect:
+            screen.blit(self.ghost_surface(block), rect)
+        return rect
@@ -0,0 +1,183 @@
+# replay.py
+#
+# Compact binary game recordings: the RNG seed and piece generator name plus
+# one 4-byte record per placement (slot, shape id, row, col). A replay is
+# re-simulated through the same GameCore placement and line-clearing logic at
+# full speed and checked against the recorded final board and score.
+#
+#   python src/replay.py games/*.bbr
+#   python src/replay.py game.bbr --render-frames 5,10,20 --out-dir frames
+
+import argparse
+import os
+import struct
+import sys
+from board import Board
+
+MAGIC = b"BBRP"
+VERSION = 2  # 2: shape ids index the de-duplicated piece catalog, generator name stored
+HEADER = struct.Struct("<4sBBQI16s")  # magic, version, grid size, seed, move count, generator
+MOVE = struct.Struct("<BBBB")  # slot, shape id, row, col
+TRAILER = struct.Struct("<I")  # final score, followed by the final occupancy bits
+
+
+MAX_SEED = (1 << 64) - 1  # The header stores the seed as an unsigned 64-bit integer
+MAX_GRID_SIZE = 255
+
+
+class ReplayError(Exception):
+    pass
+
+
+def check_recordable(seed, grid_size):
+    # Raise ReplayError for games the header cannot describe, before any is
+    # played. A None seed is drawn by GameCore and always fits.
+    if seed is not None and (not isinstance(seed, int) or not 0 <= seed <= MAX_SEED):
+        raise ReplayError(f"Replays need a seed between 0 and {MAX_SEED}, not {seed!r}")
+    if not 1 <= grid_size <= MAX_GRID_SIZE:
+        raise ReplayError(f"Replays need a grid size between 1 and {MAX_GRID_SIZE}, not {grid_size}")
+
+
+class Replay:
+    def __init__(self, seed, grid_size=8, moves=None, final_score=None, final_occupancy=None,
+                 generator="weighted"):
+        check_recordable(seed, grid_size)
+        self.seed = seed
+        self.grid_size = grid_size
+        self.generator = generator  # piece_generator.GENERATORS strategy the game was dealt with
+        self.moves = moves if moves is not None else []  # (slot, shape_id, row, col)
+        self.final_score = final_score
+        self.final_occupancy = final_occupancy
+
+    def record(self, slot, shape_id, row, col):
+        self.moves.append((slot, shape_id, row, col))
+
+    def finish(self, core):
+        # Capture the final state so playback can be verified against it
+        self.final_score = core.score
+        self.final_occupancy = core.board.occupancy
+
+    def occupancy_bytes(self):
+        return (self.grid_size * self.grid_size + 7) // 8
+
+    def to_bytes(self):
+        generator = self.generator.encode("ascii")
+        if len(generator) > 16:
+            raise ReplayError(f"Generator name {self.generator!r} is too long for the replay header")
+        parts = [HEADER.pack(MAGIC, VERSION, self.grid_size, self.seed, len(self.moves), generator)]
+        parts.extend(MOVE.pack(*move) for move in self.moves)
+        parts.append(TRAILER.pack(self.final_score or 0))
+        parts.append((self.final_occupancy or 0).to_bytes(self.occupancy_bytes(), "little"))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < HEADER.size:
+            raise ReplayError("File too short for a replay header")
+        magic, version, grid_size, seed, count, generator = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError("Not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"Unsupported replay version {version}")
+        replay = cls(seed, grid_size, generator=generator.rstrip(b"\0").decode("ascii", "replace"))
+        offset = HEADER.size
+        if len(data) < offset + count * MOVE.size + TRAILER.size + replay.occupancy_bytes():
+            raise ReplayError("Replay is truncated")
+        replay.moves = list(MOVE.iter_unpack(data[offset:offset + count * MOVE.size]))
+        offset += count * MOVE.size
+        (replay.final_score,) = TRAILER.unpack_from(data, offset)
+        offset += TRAILER.size
+        replay.final_occupancy = int.from_bytes(data[offset:offset + replay.occupancy_bytes()], "little")
+        return replay
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+def play_back(replay, on_move=None):
+    # Re-simulate a replay at full speed and verify it; returns the final GameCore.
+    # on_move(core, move_number) is called after every placement.
+    from core import GameCore  # core imports this module for recording
+
+    try:
+        core = GameCore(replay.grid_size, seed=replay.seed, generator=replay.generator)
+    except ValueError as e:
+        raise ReplayError(str(e)) from e
+    for move_number, (slot, shape_id, row, col) in enumerate(replay.moves, 1):
+        piece = core.pieces[slot] if slot < len(core.pieces) else None
+        if piece is None or core.shape_ids[piece.name] != shape_id:
+            raise ReplayError(f"Move {move_number}: slot {slot} does not hold shape {shape_id}")
+        try:
+            core.step(slot, row, col)
+        except ValueError as e:
+            raise ReplayError(f"Move {move_number}: {e}") from e
+        if on_move:
+            on_move(core, move_number)
+
+    if replay.final_occupancy is not None and core.board.occupancy != replay.final_occupancy:
+        raise ReplayError("Final board does not match the recording")
+    if replay.final_score is not None and core.score != replay.final_score:
+        raise ReplayError(f"Final score {core.score} does not match recorded {replay.final_score}")
+    return core
+
+
+class FrameRenderer:
+    # Saves PNG snapshots of the board during playback (uses SDL's dummy driver
+    # when no display is available)
+
+    def __init__(self, grid_size, out_dir, cell_size=50):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+        from render_cache import TileCache, GridLayer
+
+        self.pygame = pygame
+        self.out_dir = out_dir
+        size = grid_size * cell_size
+        pygame.display.init()
+        pygame.display.set_mode((size, size))
+        self.layer = GridLayer((size, size), 0, 0, grid_size, cell_size, TileCache())
+
+    def save(self, board, name):
+        self.layer.sync(board)
+        self.pygame.image.save(self.layer.surface, os.path.join(self.out_dir, name))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verify Block Blast replays at full speed")
+    parser.add_argument("paths", nargs="+", help="replay files")
+    parser.add_argument("--render-frames", default="",
+                        help="comma-separated move numbers to save as PNG (0 = start)")
+    parser.add_argument("--out-dir", default=".", help="directory for rendered frames")
+    args = parser.parse_args(argv)
+
+    frames = {int(n) for n in args.render_frames.split(",") if n.strip()}
+    failures = 0
+    for path in args.paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        try:
+            replay = Replay.load(path)
+            renderer = FrameRenderer(replay.grid_size, args.out_dir) if frames else None
+
+            def on_move(core, move_number):
+                if move_number in frames:
+                    renderer.save(core.board, f"{stem}_{move_number:05d}.png")
+
+            if renderer and 0 in frames:
+                renderer.save(Board(replay.grid_size), f"{stem}_00000.png")
+            core = play_back(replay, on_move if renderer else None)
+        except (OSError, ReplayError) as e:
+            failures += 1
+            print(f"{path}: FAILED ({e})")
+            continue
+        print(f"{path}: ok ({core.moves} moves, score {core.score}, {core.lines_cleared} lines)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+# selfplay.py
+#
+# Run many complete headless games across a process pool and report throughput,
+# game length, lines cleared and game-over causes.
+#
+#   python src/selfplay.py --games 1000 --policy greedy --workers 4 --format json
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from core import GameCore
+from piece_generator import GENERATORS
+from policies import load_policy
+from position_archive import PositionWriter
+from utils import percentile
+
+LENGTH_PERCENTILES = (50, 90, 99)
+
+
+def play_game(task):
+    # Play one game to completion in a worker process
+    seed, policy_spec, grid_size, max_moves, archive, generator = task
+    policy = load_policy(policy_spec)
+    # A separate stream from the core's, so move choices don't track piece spawns
+    rng = random.Random(f"policy:{seed}")
+    core = GameCore(grid_size, seed=seed, generator=generator)
+
+    # Each worker process appends positions to its own archive file
+    writer = PositionWriter(f"{archive}.{os.getpid()}", grid_size) if archive else None
+    if writer:
+        writer.attach(core)
+
+    start = time.perf_counter()
+    while not core.done and core.moves < max_moves:
+        core.step(*policy(core, rng))
+    elapsed = time.perf_counter() - start
+    if writer:
+        writer.close()
+
+    if core.done:
+        # Name the pieces that were left with nowhere to go
+        stuck = sorted(piece.name for piece in core.pieces if piece)
+        cause = "no_fit:" + "+".join(stuck)
+    else:
+        cause = "move_limit"
+    return {
+        "seed": seed,
+        "moves": core.moves,
+        "lines_cleared": core.lines_cleared,
+        "score": core.score,
+        "cause": cause,
+        "seconds": elapsed,
+    }
+
+
+def run_games(games, policy_spec="random", workers=None, seed=0, grid_size=8, max_moves=100000,
+              archive=None, generator="weighted"):
+    # Game i always uses seed + i, so results are reproducible for any worker count
+    tasks = [(seed + i, policy_spec, grid_size, max_moves, archive, generator) for i in range(games)]
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [play_game(task) for task in tasks]
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(play_game, tasks, chunksize=max(1, games // (workers * 4)))
+    wall_time = time.perf_counter() - start
+    return summarize(results, wall_time, policy_spec, workers, seed, generator)
+
+
+def summarize(results, wall_time, policy_spec, workers, seed, generator="weighted"):
+    lengths = sorted(result["moves"] for result in results)
+    lines = [result["lines_cleared"] for result in results]
+    placements = sum(lengths)
+    games = len(results)
+    causes = Counter(
+        "move_limit" if result["cause"] == "move_limit" else "no_fit" for result in results
+    )
+    stuck_pieces = Counter(
+        name
+        for result in results if result["cause"].startswith("no_fit:")
+        for name in result["cause"][len("no_fit:"):].split("+")
+    )
+    return {
+        "policy": policy_spec,
+        "generator": generator,
+        "workers": workers,
+        "seed": seed,
+        "games": games,
+        "wall_time": wall_time,
+        "games_per_second": games / wall_time if wall_time else 0.0,
+        "placements": placements,
+        "placements_per_second": placements / wall_time if wall_time else 0.0,
+        "mean_length": placements / games if games else 0.0,
+        "length_percentiles": {f"p{pct}": percentile(lengths, pct) for pct in LENGTH_PERCENTILES},
+        "lines_cleared": sum(lines),
+        "mean_lines_cleared": sum(lines) / games if games else 0.0,
+        "mean_score": sum(result["score"] for result in results) / games if games else 0.0,
+        "game_over_causes": dict(causes),
+        "stuck_pieces": dict(stuck_pieces.most_common()),
+    }
+
+
+def to_csv(report):
+    # Flatten the report into a single header + row
+    row = {}
+    for key, value in report.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                row[f"{key}.{sub_key}"] = sub_value
+        else:
+            row[key] = value
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(row))
+    writer.writeheader()
+    writer.writerow(row)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Block Blast self-play benchmark")
+    parser.add_argument("--games", type=int, default=100, help="number of games to play")
+    parser.add_argument("--policy", default="random",
+                        help="random, greedy, or module:function taking (core, rng)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="base seed; game i uses seed + i")
+    parser.add_argument("--grid-size", type=int, default=8)
+    parser.add_argument("--max-moves", type=int, default=100000, help="stop a game after this many moves")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--output", help="write the report here instead of stdout")
+    parser.add_argument("--archive", metavar="PREFIX",
+                        help="record every position to PREFIX.<worker pid> position archives")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="weighted",
+                        help="piece generator strategy")
+    args = parser.parse_args(argv)
+
+    report = run_games(args.games, args.policy, args.workers, args.seed, args.grid_size, args.max_moves,
+                       args.archive, args.generator)
+    text = json.dumps(report, indent=2) + "\n" if args.format == "json" else to_csv(report)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
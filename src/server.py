@@ -0,0 +1,227 @@
+# server.py
+#
+# Local asyncio server hosting many independent headless games in one process.
+# Clients speak line-delimited JSON over TCP (or a Unix socket); each request is
+# one object with an "op" and an optional "id" that is echoed in the response.
+#
+#   {"op": "new", "seed": 1}                          -> session id and state
+#   {"op": "state", "session": 3}                     -> board, pieces, score
+#   {"op": "legal", "session": 3}                     -> [[piece, row, col], ...]
+#   {"op": "place", "session": 3, "piece": 0, "row": 2, "col": 5}
+#   {"op": "close", "session": 3}
+#
+#   python src/server.py --port 7777
+#   python src/server.py --unix /tmp/blockblast.sock
+
+import argparse
+import asyncio
+import itertools
+import json
+
+from core import GameCore
+from piece_generator import GENERATORS
+
+DEFAULT_PORT = 7777
+MAX_LINE_BYTES = 64 * 1024  # Longest request line accepted
+MAX_PENDING = 32  # Queued requests per session before the connection stops being read
+MAX_SESSIONS_PER_CONNECTION = 256
+MAX_GRID_SIZE = 64
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def int_field(request, name, default=None):
+    # A JSON integer field; floats, strings and booleans are rejected
+    value = request.get(name, default)
+    if value is None:
+        raise ProtocolError(f"{request.get('op')} needs {name}")
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ProtocolError(f"{name} must be an integer, not {value!r}")
+    return value
+
+
+def game_state(core):
+    return {
+        "grid_size": core.grid_size,
+        "occupancy": format(core.board.occupancy, "x"),  # Bit row * size + col, as hex
+        "pieces": [piece.name if piece else None for piece in core.pieces],
+        "score": core.score,
+        "moves": core.moves,
+        "lines_cleared": core.lines_cleared,
+        "done": core.done,
+    }
+
+
+class Session:
+    # One game plus a bounded request queue. Requests for a session are applied
+    # in order by its own task; when the queue is full the connection's reader
+    # waits, which stops reading from the socket and pushes back on the client.
+
+    def __init__(self, session_id, core, respond):
+        self.id = session_id
+        self.core = core
+        self.respond = respond
+        self.queue = asyncio.Queue(MAX_PENDING)
+        self.task = asyncio.create_task(self.run())
+
+    async def run(self):
+        while True:
+            request = await self.queue.get()
+            if request is None:
+                return
+            await self.respond(request, self.apply, request)
+
+    def apply(self, request):
+        op = request["op"]
+        core = self.core
+        if op == "state":
+            return {"state": game_state(core)}
+        if op == "legal":
+            return {"moves": core.legal_moves()}
+        if op == "place":
+            piece, row, col = (int_field(request, name) for name in ("piece", "row", "col"))
+            if not 0 <= piece < len(core.pieces):
+                raise ProtocolError(f"No piece slot {piece}")
+            lines, score, done = core.step(piece, row, col)
+            event = core.last_clear
+            return {
+                "lines": lines,
+                "cleared_rows": list(event.rows),
+                "cleared_cols": list(event.cols),
+                "combo": event.combo,
+                "state": game_state(core),
+            }
+        raise ProtocolError(f"Unknown op {op!r}")
+
+    async def close(self):
+        await self.queue.put(None)
+        await self.task
+
+
+class GameServer:
+    def __init__(self, max_sessions=10000):
+        self.max_sessions = max_sessions
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+        self.sessions_created = 0
+        self.requests = 0
+
+    async def handle_connection(self, reader, writer):
+        owned = {}  # Sessions created on this connection, closed when it drops
+        write_lock = asyncio.Lock()
+
+        async def respond(request, handler, *args):
+            self.requests += 1
+            response = {"id": request.get("id")} if isinstance(request, dict) else {"id": None}
+            try:
+                response.update(handler(*args))
+                response["ok"] = True
+            except (ProtocolError, ValueError, TypeError) as e:
+                response["ok"] = False
+                response["error"] = str(e)
+            except Exception as e:
+                # Anything else is a server bug, but it must not take the
+                # session task or the connection down with it
+                response["ok"] = False
+                response["error"] = f"Internal error: {type(e).__name__}: {e}"
+            async with write_lock:
+                writer.write(json.dumps(response, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    await respond({}, self.fail, "Request line too long")
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict) or "op" not in request:
+                        raise ValueError("Request must be an object with an op")
+                except ValueError as e:
+                    await respond({}, self.fail, f"Bad request: {e}")
+                    continue
+
+                op = request["op"]
+                session_id = request.get("session")
+                if op != "new" and (not isinstance(session_id, int) or isinstance(session_id, bool)):
+                    await respond(request, self.fail, f"session must be an integer id, not {session_id!r}")
+                elif op == "new":
+                    await respond(request, self.new_session, request, owned, respond)
+                elif op == "close":
+                    session = owned.pop(session_id, None)
+                    if session:
+                        del self.sessions[session.id]
+                        await session.close()  # Requests already queued are answered first
+                    await respond(request, self.closed, session, session_id)
+                else:
+                    session = owned.get(session_id)
+                    if session is None:
+                        await respond(request, self.fail, f"Unknown session {session_id!r}")
+                    else:
+                        await session.queue.put(request)
+        except ConnectionError:
+            pass
+        finally:
+            for session in list(owned.values()):
+                self.sessions.pop(session.id, None)
+                session.task.cancel()
+            writer.close()
+
+    def fail(self, message):
+        raise ProtocolError(message)
+
+    def new_session(self, request, owned, respond):
+        if len(self.sessions) >= self.max_sessions or len(owned) >= MAX_SESSIONS_PER_CONNECTION:
+            raise ProtocolError("Too many sessions")
+        generator = request.get("generator", "weighted")
+        if generator not in GENERATORS:
+            raise ProtocolError(f"Unknown generator {generator!r}")
+        grid_size = int_field(request, "grid_size", 8)
+        if not 1 <= grid_size <= MAX_GRID_SIZE:
+            raise ProtocolError(f"grid_size must be between 1 and {MAX_GRID_SIZE}")
+        seed = int_field(request, "seed") if request.get("seed") is not None else None
+        core = GameCore(grid_size, seed=seed, generator=generator)
+        session = Session(next(self.session_ids), core, respond)
+        self.sessions[session.id] = owned[session.id] = session
+        self.sessions_created += 1
+        return {"session": session.id, "seed": core.seed, "state": game_state(core)}
+
+    def closed(self, session, session_id):
+        if session is None:
+            raise ProtocolError(f"Unknown session {session_id!r}")
+        return {"session": session.id}
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle_connection, unix_path, limit=MAX_LINE_BYTES)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_LINE_BYTES)
+
+
+async def serve(host, port, unix_path, max_sessions):
+    server = await GameServer(max_sessions).start(host, port, unix_path)
+    print(f"Serving on {unix_path or f'{host}:{port}'}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Block Blast game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.max_sessions))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
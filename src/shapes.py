@@ -0,0 +1,70 @@
+# Block templates
+BLOCK_SHAPES = {
+
+    "3x3_block": [[1, 1, 1], [1, 1, 1], [1, 1, 1]],
+    "2x2_block": [[1, 1], [1, 1]],
+    "1x1_block": [[1]],
+
+    "2x3_horizontal": [[1, 1, 1], [1, 1, 1]],
+    "2x3_vertical": [[1, 1], [1, 1], [1, 1]],
+
+    "T_block": [[0, 1, 0], [1, 1, 1]],
+    "T_block_upside_down": [[1, 1, 1], [0, 1, 0]],
+    "T_block_left": [[1, 0], [1, 1], [1, 0]],
+    "T_block_right": [[0, 1], [1, 1], [0, 1]],
+
+
+    "L_block_right": [[1, 0], [1, 0], [1, 1]],
+    "L_block__right_one_rotation": [[1, 1, 1], [1, 0, 0]],
+    "L_block_right_two_rotation": [[1, 1], [0, 1], [0, 1]],
+    "L_block_right_three_rotation": [[1, 1], [1, 0], [1, 0]],
+
+
+
+
+    "L_large_block": [[1, 1, 1], [1, 0, 0], [1, 0, 0]],
+    "L_large_block_one_rotation": [[1, 1, 1], [0, 0, 1], [0, 0, 1]],
+    "L_large_block_two_rotation": [[0, 0, 1], [0, 0, 1], [1, 1, 1]],
+    "L_large_block_three_rotation": [[1, 0, 0], [1, 0, 0], [1, 1, 1]],
+
+
+
+    "corner_left": [[1, 1], [0, 1]],
+    "corner_right": [[1, 0], [1, 1]],
+    "corner_left_upside_down": [[0, 1], [1, 1]],
+    "corner_right_upside_down": [[1, 1], [1, 0]],
+
+    "z_block": [[1, 1, 0], [0, 1, 1]],
+    "z_block_one_rotation": [[0, 1], [1, 1], [1, 0]],
+    "z_block_two_rotation": [[1, 0], [1, 1], [0, 1]],
+
+    "s_block": [[0, 1, 1], [1, 1, 0]],
+    "s_block_one_rotation": [[1, 0], [1, 1], [0, 1]],
+    "s_block_two_rotation": [[1, 1, 0], [0, 1, 1]],
+
+
+    "1x5_horizontal": [[1, 1, 1, 1, 1]],
+    "1x4_horizontal": [[1, 1, 1, 1]],
+    "1x3_horizontal": [[1, 1, 1]],
+    "1x2_horizontal": [[1, 1]],
+
+    "1x5_vertical": [[1], [1], [1], [1], [1]],
+    "1x4_vertical": [[1], [1], [1], [1]],
+    "1x3_vertical": [[1], [1], [1]],
+    "1x2_vertical": [[1], [1]],
+
+
+
+}
+
+# Predefined neon colors
+NEON_COLORS = [
+    (255, 0, 255),  # Magenta
+    (0, 255, 255),  # Cyan
+    (255, 255, 0),  # Yellow
+    (255, 0, 0),    # Bright Red
+    (0, 255, 0),    # Bright Green
+    (0, 0, 255),    # Bright Blue
+    (255, 128, 0),  # Neon Orange
+    (128, 0, 255),  # Neon Purple
+]
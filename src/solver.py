@@ -0,0 +1,160 @@
+from concurrent.futures import ProcessPoolExecutor
+from board import Board
+from placement import PlacementIndex
+from piece_generator import CATALOG
+
+# Search scoring weights
+LINE_WEIGHT = 20  # Per line cleared along the sequence
+ISOLATED_PENALTY = 3  # Per empty cell with no empty neighbour on the final board
+UNPLACED_PENALTY = 1000  # Per piece the sequence could not place
+
+MAX_TABLE_SIZE = 500000  # Transposition table entries; new results are not stored past this
+MAX_NODES = 250000  # Positions visited per search before it settles for the best found so far
+MAX_HINT_GRID_SIZE = 8  # The search grows roughly with the sixth power of the grid size
+
+
+class Solver:
+    # Exhaustive search over every ordering and placement of the current pieces.
+    # Results are memoised in a transposition table keyed on (occupancy,
+    # remaining shape names), so positions reached through different orders,
+    # or with two identical pieces swapped, are only evaluated once.
+    #
+    # Each search visits at most max_nodes positions. Past that it returns the
+    # best sequence found so far, and nothing more is stored in the table,
+    # since results cut short are not exact.
+
+    def __init__(self, grid_size=8, catalog=CATALOG):
+        self.board = Board(grid_size)
+        self.placement_index = PlacementIndex(catalog.shape_dict, grid_size)
+        self.table = {}
+        self.nodes_left = 0
+
+        full = self.board.full_mask
+        self.not_left_col = full & ~self.board.col_masks[0]
+        self.not_right_col = full & ~self.board.col_masks[-1]
+
+    def evaluate(self, occupancy):
+        # Board quality: more empty cells is better, isolated holes are worse
+        size = self.board.size
+        full = self.board.full_mask
+        empty = full & ~occupancy
+        neighbours = (
+            ((empty >> 1) & self.not_right_col)
+            | ((empty << 1) & self.not_left_col)
+            | (empty >> size)
+            | ((empty << size) & full)
+        )
+        isolated = empty & ~neighbours
+        return bin(empty).count("1") - ISOLATED_PENALTY * bin(isolated).count("1")
+
+    def solve(self, occupancy, pieces, max_nodes=MAX_NODES):
+        # pieces holds a shape name per slot (None for placed slots). Returns
+        # (value, [(slot, row, col), ...]) for the best sequence found.
+        if len(self.table) >= MAX_TABLE_SIZE:
+            self.table.clear()
+        self.nodes_left = max_nodes
+        names = tuple(sorted(name for name in pieces if name))
+        value, moves = self._search(occupancy, names)
+
+        # Map shape names in the sequence back onto free slots
+        free = [(slot, name) for slot, name in enumerate(pieces) if name]
+        sequence = []
+        for name, row, col in moves:
+            index = next(i for i, (_, slot_name) in enumerate(free) if slot_name == name)
+            sequence.append((free.pop(index)[0], row, col))
+        return value, sequence
+
+    def _search(self, occupancy, names):
+        self.nodes_left -= 1
+        # Stopping here leaves every remaining piece unplaced
+        best_value = self.evaluate(occupancy) - UNPLACED_PENALTY * len(names)
+        if not names:
+            return best_value, ()  # Leaves are cheaper to evaluate than to store
+        key = (occupancy, names)
+        hit = self.table.get(key)
+        if hit is not None:
+            return hit
+
+        best_moves = ()
+        expanded = False
+        full_lines = self.board.full_lines
+        for i, name in enumerate(names):
+            if i and names[i - 1] == name:
+                continue  # Identical pieces lead to identical subtrees
+            rest = names[:i] + names[i + 1:]
+            for (col, row), mask in self.placement_index.compiled(name).origins.items():
+                if occupancy & mask:
+                    continue
+                if self.nodes_left <= 0:
+                    return best_value, best_moves  # Out of budget
+                expanded = True
+                placed = occupancy | mask
+                cleared, lines = full_lines(placed)
+                value, moves = self._search(placed & ~cleared, rest)
+                value += lines * LINE_WEIGHT
+                if value > best_value:
+                    best_value = value
+                    best_moves = ((name, row, col),) + moves
+
+        result = (best_value, best_moves)
+        # Dead ends are leaves too; children cut short by the budget are not exact
+        if expanded and self.nodes_left > 0 and len(self.table) < MAX_TABLE_SIZE:
+            self.table[key] = result
+        return result
+
+
+_solvers = {}
+
+
+def solve_position(grid_size, occupancy, pieces):
+    # Process-pool entry point; each worker keeps one Solver (and its table) per size
+    solver = _solvers.get(grid_size)
+    if solver is None:
+        solver = _solvers[grid_size] = Solver(grid_size)
+    return solver.solve(occupancy, list(pieces))
+
+
+class HintWorker:
+    # Runs the solver in a separate process so the render loop never blocks.
+    # request() is cheap to call every frame; a new search starts only when the
+    # position changes, and poll() returns the hint once it is ready. A search
+    # that is already running cannot be cancelled, but the node budget bounds it.
+
+    def __init__(self, grid_size=8):
+        self.grid_size = grid_size
+        self.executor = ProcessPoolExecutor(max_workers=1)
+        self.pending_key = None
+        self.future = None
+        self.hint = None
+
+    def request(self, occupancy, pieces):
+        key = (occupancy, tuple(pieces))
+        if key == self.pending_key:
+            return
+        self.pending_key = key
+        self.hint = None
+        if self.future:
+            self.future.cancel()
+        self.future = self.executor.submit(solve_position, self.grid_size, occupancy, key[1])
+
+    def poll(self):
+        # The best move sequence for the latest position, or None while searching
+        if self.future and self.future.done():
+            future, self.future = self.future, None
+            if not future.cancelled():
+                self.hint = future.result()[1]
+        return self.hint
+
+    def discard(self):
+        # Forget the current search; a running one finishes unobserved
+        if self.future:
+            self.future.cancel()
+        self.future = None
+        self.pending_key = None
+        self.hint = None
+
+    def searching(self):
+        return self.future is not None
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
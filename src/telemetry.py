@@ -0,0 +1,281 @@
+# telemetry.py
+#
+# Per-session gameplay and performance telemetry in a local SQLite database.
+# The game only appends tuples to an in-memory buffer; a background thread
+# writes them in bulk, so the render loop never waits on disk I/O.
+#
+#   python src/main.py --telemetry telemetry.db
+#   python src/telemetry.py telemetry.db summary
+#   python src/telemetry.py telemetry.db shapes
+#   python src/telemetry.py telemetry.db frames
+
+import argparse
+import json
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+FLUSH_INTERVAL = 1.0  # Seconds between background flushes
+FLUSH_BATCH = 500  # Buffered records that trigger an early flush
+MAX_BUFFERED = 100000  # Records held while the disk falls behind; newer ones are dropped
+DB_TIMEOUT = 5.0  # Seconds a write waits for another writer's lock before failing
+FRAME_BUCKET_US = 100  # Width of a frame-time histogram bucket in microseconds
+MAX_FRAME_US = 250000  # Frames slower than this share the last bucket
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    started REAL,
+    ended REAL,
+    seed TEXT,  -- Any Python int, which may not fit a 64-bit INTEGER
+    grid_size INTEGER,
+    score INTEGER,
+    moves INTEGER,
+    lines_cleared INTEGER,
+    game_over INTEGER,
+    final_occupancy TEXT,
+    frames INTEGER
+);
+CREATE TABLE IF NOT EXISTS events (
+    session_id TEXT,
+    time REAL,
+    kind TEXT,
+    slot INTEGER,
+    shape TEXT,
+    row INTEGER,
+    col INTEGER,
+    lines INTEGER,
+    cells_cleared INTEGER,
+    combo INTEGER,
+    score INTEGER
+);
+CREATE TABLE IF NOT EXISTS frame_histogram (
+    session_id TEXT,
+    bucket_us INTEGER,  -- Lower edge of the bucket
+    count INTEGER,
+    PRIMARY KEY (session_id, bucket_us)
+);
+CREATE INDEX IF NOT EXISTS events_kind ON events (kind, shape);
+"""
+
+INSERT_EVENT = "INSERT INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+UPSERT_SESSION = "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+UPSERT_FRAMES = "INSERT OR REPLACE INTO frame_histogram VALUES (?, ?, ?)"
+
+
+class TelemetrySink:
+    # Buffers telemetry records and writes them from a background thread.
+    # Every method called from the game is an in-memory append. The database is
+    # opened up front so a bad path fails at startup; a failed flush keeps its
+    # batch for the next attempt, and close() reports anything left unsaved.
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL, flush_batch=FLUSH_BATCH):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.session_id = uuid.uuid4().hex
+        self.started = time.time()
+        self.frame_histogram = Counter()
+        self.frames = 0
+        self.dropped = 0  # Records refused because the buffer was full
+        self.written = 0
+        self.failed_flushes = 0
+        self.last_error = None
+
+        # Only the writer thread uses the connection once it is running
+        self.connection = sqlite3.connect(path, timeout=DB_TIMEOUT, check_same_thread=False)
+        try:
+            self.connection.executescript(SCHEMA)
+        except sqlite3.Error:
+            self.connection.close()
+            raise
+
+        self.lock = threading.Lock()
+        self.buffer = []  # (statement, row) tuples waiting to be written
+        self.wake = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self.writer, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def push(self, statement, row):
+        with self.lock:
+            if len(self.buffer) >= MAX_BUFFERED:
+                self.dropped += 1
+                return
+            self.buffer.append((statement, row))
+            if len(self.buffer) >= self.flush_batch:
+                self.wake.set()
+
+    def event(self, kind, slot=None, shape=None, row=None, col=None, lines=None, cells_cleared=None,
+              combo=None, score=None):
+        self.push(INSERT_EVENT, (self.session_id, time.time(), kind, slot, shape, row, col, lines,
+                                 cells_cleared, combo, score))
+
+    def placement(self, core, slot, shape, row, col):
+        # One committed placement and the line clear it produced
+        clear = core.last_clear
+        self.event("place", slot, shape, row, col, clear.lines, clear.cells, clear.combo, core.score)
+
+    def frame(self, seconds):
+        bucket = min(int(seconds * 1e6), MAX_FRAME_US) // FRAME_BUCKET_US * FRAME_BUCKET_US
+        self.frame_histogram[bucket] += 1
+        self.frames += 1
+
+    def session(self, core, game_over, ended=None):
+        # Snapshot the session summary row (rewritten whenever it changes)
+        self.push(UPSERT_SESSION, (
+            self.session_id, self.started, ended, str(core.seed), core.grid_size, core.score, core.moves,
+            core.lines_cleared, int(game_over), format(core.board.occupancy, "x"), self.frames,
+        ))
+
+    def close(self, core, game_over):
+        # Final session row and frame histogram, then drain the buffer. Returns
+        # what was written and lost so the caller can report failures.
+        self.session(core, game_over, time.time())
+        for bucket, count in sorted(self.frame_histogram.items()):
+            self.push(UPSERT_FRAMES, (self.session_id, bucket, count))
+        self.stopping = True
+        self.wake.set()
+        self.thread.join()
+        return {
+            "written": self.written,
+            "unsaved": len(self.buffer),
+            "dropped": self.dropped,
+            "failed_flushes": self.failed_flushes,
+            "last_error": str(self.last_error) if self.last_error else None,
+        }
+
+    def writer(self):
+        try:
+            while True:
+                self.wake.wait(self.flush_interval)
+                self.wake.clear()
+                stopping = self.stopping
+                self.flush()
+                if stopping:
+                    return
+        finally:
+            self.connection.close()
+
+    def flush(self):
+        with self.lock:
+            batch, self.buffer = self.buffer, []
+        if not batch:
+            return
+        # Group consecutive rows per statement and write them in one transaction
+        try:
+            with self.connection:
+                start = 0
+                for end in range(1, len(batch) + 1):
+                    if end == len(batch) or batch[end][0] != batch[start][0]:
+                        self.connection.executemany(batch[start][0], [row for _, row in batch[start:end]])
+                        start = end
+        except Exception as e:
+            # Keep the batch (ahead of newer records) for the next flush; any
+            # error, not only sqlite3.Error, must not stop the writer thread
+            self.failed_flushes += 1
+            self.last_error = e
+            with self.lock:
+                kept = batch + self.buffer
+                self.dropped += max(0, len(kept) - MAX_BUFFERED)
+                self.buffer = kept[:MAX_BUFFERED]
+            return
+        self.written += len(batch)
+
+
+def histogram_percentiles(rows, percentiles=(50, 95, 99)):
+    # Nearest-rank percentiles from (bucket, count) rows sorted by bucket
+    total = sum(count for _, count in rows)
+    result = {}
+    for pct in percentiles:
+        target = max(1, -(-pct * total // 100))
+        seen = 0
+        for bucket, count in rows:
+            seen += count
+            if seen >= target:
+                result[f"p{pct}"] = bucket
+                break
+    return result
+
+
+def query_summary(connection):
+    sessions = connection.execute(
+        "SELECT COUNT(*), AVG(score), MAX(score), AVG(moves), AVG(lines_cleared), SUM(game_over), "
+        "AVG(ended - started), SUM(frames) FROM sessions"
+    ).fetchone()
+    events = dict(connection.execute("SELECT kind, COUNT(*) FROM events GROUP BY kind").fetchall())
+    clears = connection.execute(
+        "SELECT COUNT(*), AVG(lines), MAX(combo) FROM events WHERE kind = 'place' AND lines > 0"
+    ).fetchone()
+    return {
+        "sessions": sessions[0],
+        "mean_score": sessions[1],
+        "best_score": sessions[2],
+        "mean_moves": sessions[3],
+        "mean_lines_cleared": sessions[4],
+        "games_over": sessions[5],
+        "mean_session_seconds": sessions[6],
+        "frames": sessions[7],
+        "events": events,
+        "clearing_placements": clears[0],
+        "mean_lines_per_clear": clears[1],
+        "best_combo": clears[2],
+    }
+
+
+def query_shapes(connection):
+    rows = connection.execute(
+        "SELECT shape, SUM(kind = 'place'), SUM(kind = 'rejected'), SUM(COALESCE(lines, 0)) "
+        "FROM events WHERE shape IS NOT NULL GROUP BY shape ORDER BY 2 DESC"
+    ).fetchall()
+    return {shape: {"placed": placed, "rejected": rejected, "lines": lines}
+            for shape, placed, rejected, lines in rows}
+
+
+def query_frames(connection):
+    rows = connection.execute(
+        "SELECT bucket_us, SUM(count) FROM frame_histogram GROUP BY bucket_us ORDER BY bucket_us"
+    ).fetchall()
+    return {
+        "frames": sum(count for _, count in rows),
+        "frame_ms": {name: bucket / 1000 for name, bucket in histogram_percentiles(rows).items()},
+        "histogram_ms": {bucket / 1000: count for bucket, count in rows},
+    }
+
+
+def query_sessions(connection, limit=20):
+    rows = connection.execute(
+        "SELECT session_id, started, ended, seed, score, moves, lines_cleared, game_over "
+        "FROM sessions ORDER BY started DESC LIMIT ?", (limit,)
+    ).fetchall()
+    keys = ("session_id", "started", "ended", "seed", "score", "moves", "lines_cleared", "game_over")
+    return [dict(zip(keys, row)) for row in rows]
+
+
+QUERIES = {
+    "summary": query_summary,
+    "shapes": query_shapes,
+    "frames": query_frames,
+    "sessions": query_sessions,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate Block Blast telemetry")
+    parser.add_argument("database", help="SQLite file written with main.py --telemetry")
+    parser.add_argument("query", choices=sorted(QUERIES), nargs="?", default="summary")
+    args = parser.parse_args(argv)
+
+    connection = sqlite3.connect(f"file:{args.database}?mode=ro", uri=True)
+    try:
+        result = QUERIES[args.query](connection)
+    finally:
+        connection.close()
+    sys.stdout.write(json.dumps(result, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1,9 @@
-# This file is intentionally left blank.
\ No newline at end of file
+import math
+
+
+def percentile(sorted_values, pct):
+    # Nearest-rank percentile of an already sorted sequence (0 for empty input)
+    if not sorted_values:
+        return 0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]